@@ -0,0 +1,115 @@
+import atexit
+import logging
+import os
+import threading
+
+from playwright.sync_api import TimeoutError as PWTimeout, sync_playwright
+
+log = logging.getLogger("browser")
+
+# A API sync do Playwright é presa à thread que a criou, então o "singleton"
+# é por thread: cada thread tem seu Playwright e seus browsers.
+_local = threading.local()
+
+
+# Flags de launch comuns: sem GPU/extensões (só lemos DOM), /dev/shm fora do
+# caminho (pequeno em container) e sem o sinal de automação do Blink. Imagens
+# desligadas no Blink nem chegam a virar request (o resource_blocker abortaria
+# de qualquer forma, mas cada uma custava uma ida e volta pela rota).
+LEAN_CHROMIUM_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+# Com BROWSER_CDP_URL (ex.: http://localhost:9222) o run se conecta a um
+# Chromium já de pé em vez de lançar um: o cold start sai do run e o
+# user-data-dir do Chromium externo guarda cookies/cache entre runs. As
+# opções de launch passam a ser do processo externo.
+BROWSER_CDP_URL = (os.getenv("BROWSER_CDP_URL", "") or "").strip()
+
+
+def _launch_key(launch_kwargs: dict) -> str:
+    return repr(sorted(launch_kwargs.items()))
+
+
+def get_browser(**launch_kwargs):
+    """
+    Retorna um Chromium compartilhado entre counties/runs da mesma thread.
+    Um browser por conjunto de opções de launch; o caller isola o estado com
+    browser.new_context() e fecha só o context.
+    """
+    browsers = getattr(_local, "browsers", None)
+    if browsers is None:
+        _local.playwright = sync_playwright().start()
+        _local.browsers = browsers = {}
+
+    key = "cdp" if BROWSER_CDP_URL else _launch_key(launch_kwargs)
+    browser = browsers.get(key)
+    if browser is None or not browser.is_connected():
+        if BROWSER_CDP_URL:
+            # close() num browser conectado por CDP só fecha os contexts
+            # criados aqui e desconecta; o Chromium externo continua de pé.
+            log.info("Connecting to Chromium over CDP at %s", BROWSER_CDP_URL)
+            browser = _local.playwright.chromium.connect_over_cdp(BROWSER_CDP_URL)
+        else:
+            log.info("Launching shared Chromium %s", launch_kwargs)
+            browser = _local.playwright.chromium.launch(**launch_kwargs)
+        browsers[key] = browser
+
+    return browser
+
+
+# Só texto é lido das páginas: imagens/fontes/mídia e trackers são abortados
+# antes de sair da rede. Stylesheet fica a critério do adapter, porque os
+# checks de visibilidade dependem do CSS em alguns sites.
+STATIC_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+TRACKER_HOSTS = ("googletagmanager.com", "google-analytics.com", "doubleclick.net")
+
+
+def resource_blocker(resource_types=STATIC_RESOURCE_TYPES):
+    """Handler para context.route("**/*", ...) que aborta os tipos dados e trackers."""
+    def handle(route):
+        request = route.request
+        if request.resource_type in resource_types or any(h in request.url for h in TRACKER_HOSTS):
+            route.abort()
+        else:
+            route.continue_()
+    return handle
+
+
+def wait_for_selector_quiet(page, selector: str, timeout=20_000, state="visible") -> bool:
+    """Espera o seletor; devolve False no timeout em vez de levantar."""
+    try:
+        page.wait_for_selector(selector, timeout=timeout, state=state)
+        return True
+    except PWTimeout:
+        return False
+
+
+def close_browsers():
+    """Fecha os browsers e o Playwright da thread atual."""
+    browsers = getattr(_local, "browsers", None)
+    if browsers is None:
+        return
+
+    for browser in browsers.values():
+        try:
+            browser.close()
+        except Exception:
+            pass
+
+    try:
+        _local.playwright.stop()
+    except Exception:
+        pass
+
+    _local.browsers = None
+    _local.playwright = None
+
+
+atexit.register(close_browsers)
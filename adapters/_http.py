@@ -0,0 +1,133 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+# Pool grande o bastante para os workers de detalhe do Orange falarem com
+# Supabase/app ao mesmo tempo sem descartar conexões.
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+
+# Escritas em lote (chunks de PATCH/DELETE) em voo ao mesmo tempo no Supabase.
+SUPABASE_WRITE_CONCURRENCY = int(os.getenv("SUPABASE_WRITE_CONCURRENCY", "4"))
+
+log = logging.getLogger("http")
+
+_lock = threading.Lock()
+_session = None
+
+
+class JsonSession(requests.Session):
+    """Serializa o json= dos requests com orjson em vez do encoder da stdlib."""
+
+    def request(self, method, url, *args, json=None, **kwargs):
+        if json is not None:
+            headers = dict(kwargs.get("headers") or {})
+            headers.setdefault("Content-Type", "application/json")
+            kwargs["headers"] = headers
+            kwargs["data"] = orjson.dumps(json)
+        return super().request(method, url, *args, **kwargs)
+
+
+def supabase_headers(service_key: str) -> dict:
+    """Headers de auth do PostgREST com a service role key."""
+    return {
+        "apikey": service_key,
+        "Authorization": f"Bearer {service_key}",
+        "Content-Type": "application/json",
+    }
+
+
+def get_session() -> requests.Session:
+    """
+    Session compartilhada por todos os counties para Supabase e /api/ingest.
+    Mantém as conexões keep-alive entre chamadas e entre counties, evitando
+    um handshake TCP+TLS por request.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                s = JsonSession()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def response_json(r: requests.Response):
+    """r.json() com orjson: as páginas de 1000 linhas do Supabase decodificam bem mais rápido."""
+    return orjson.loads(r.content)
+
+
+def send_with_backoff(send, attempts: int = 3, base_delay: float = 0.5) -> requests.Response:
+    """
+    Chama send() (que devolve um Response) e repete em 5xx, 429 ou erro de
+    conexão, com backoff exponencial. Os outros 4xx voltam direto: repetir não
+    muda o resultado.
+    """
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            r = send()
+            if (r.status_code < 500 and r.status_code != 429) or last:
+                return r
+        except requests.RequestException:
+            if last:
+                raise
+        time.sleep(base_delay * (2 ** attempt))
+
+
+def map_bounded(fn, items, max_workers: int = SUPABASE_WRITE_CONCURRENCY) -> list:
+    """fn(item) para cada item, até max_workers em paralelo; resultados na ordem."""
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def delete_nodes_in_batches(
+    supabase_url: str,
+    headers: dict,
+    county: str,
+    nodes: list,
+    batch_size: int = 100,
+    timeout: int = 60,
+) -> tuple:
+    """
+    DELETE em properties dos nodes do county, em lotes de node=in.(...).
+    Devolve (deleted_count, errors).
+    """
+    batches = [nodes[i:i + batch_size] for i in range(0, len(nodes), batch_size)]
+
+    def delete_batch(batch):
+        encoded = ",".join(f'"{quote(node, safe="")}"' for node in batch)
+        url = (
+            f"{supabase_url}/rest/v1/properties"
+            f"?county=eq.{quote(county, safe='')}"
+            f"&node=in.({encoded})"
+        )
+        try:
+            r = send_with_backoff(lambda: get_session().delete(url, headers=headers, timeout=timeout))
+            if r.status_code in (200, 204):
+                log.info("SUPABASE DELETE batch ok county=%s count=%s", county, len(batch))
+                return len(batch), None
+            msg = f"status={r.status_code} body={r.text[:500]}"
+            log.warning("SUPABASE DELETE batch failed county=%s: %s", county, msg)
+            return 0, msg
+        except Exception as e:
+            log.warning("SUPABASE DELETE batch exception county=%s: %s", county, e)
+            return 0, str(e)
+
+    # Os batches são independentes: vão em paralelo (SUPABASE_WRITE_CONCURRENCY).
+    outcomes = map_bounded(delete_batch, batches)
+    deleted_count = sum(count for count, _ in outcomes)
+    errors = [msg for _, msg in outcomes if msg]
+    return deleted_count, errors
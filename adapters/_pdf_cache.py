@@ -0,0 +1,115 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import orjson
+
+log = logging.getLogger("pdf-cache")
+
+# Endereço extraído por conteúdo do PDF: relatórios que não mudaram entre runs
+# não passam de novo por extração de texto/OCR. PDF_CACHE_PATH vazio desliga.
+PDF_CACHE_PATH = (os.getenv("PDF_CACHE_PATH", ".pdf_cache.sqlite") or "").strip()
+
+# Entra no digest junto com o PDF: subir a versão quando o parser de
+# endereço/OCR mudar faz os PDFs já vistos serem reprocessados.
+PDF_PARSER_VERSION = "2"
+
+_lock = threading.Lock()
+_conn = None
+
+
+def _connect():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(PDF_CACHE_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS pdf_addr ("
+            " namespace TEXT NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " PRIMARY KEY (namespace, digest))"
+        )
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS url_addr ("
+            " namespace TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, url))"
+        )
+        _conn.commit()
+    return _conn
+
+
+def pdf_digest(pdf_bytes: bytes) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    h.update(PDF_PARSER_VERSION.encode() + b"\0")
+    h.update(pdf_bytes)
+    return h.hexdigest()
+
+
+def get_cached(namespace: str, pdf_bytes: bytes) -> dict | None:
+    if not PDF_CACHE_PATH or not pdf_bytes:
+        return None
+    try:
+        with _lock:
+            row = _connect().execute(
+                "SELECT result FROM pdf_addr WHERE namespace = ? AND digest = ?",
+                (namespace, pdf_digest(pdf_bytes)),
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+    except Exception as e:
+        log.warning("PDF cache read failed: %s", e)
+        return None
+
+
+def put_cached(namespace: str, pdf_bytes: bytes, result: dict):
+    if not PDF_CACHE_PATH or not pdf_bytes:
+        return
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO pdf_addr (namespace, digest, result) VALUES (?, ?, ?)",
+                (namespace, pdf_digest(pdf_bytes), orjson.dumps(result).decode()),
+            )
+            conn.commit()
+    except Exception as e:
+        log.warning("PDF cache write failed: %s", e)
+
+
+# Endereço lido de uma página (ex.: Property Appraiser) por URL, com TTL:
+# diferente do PDF, não temos o conteúdo antes de navegar.
+def get_cached_url(namespace: str, url: str, max_age_s: int) -> dict | None:
+    if not PDF_CACHE_PATH or not url or max_age_s <= 0:
+        return None
+    try:
+        with _lock:
+            row = _connect().execute(
+                "SELECT result, fetched_at FROM url_addr WHERE namespace = ? AND url = ?",
+                (namespace, url),
+            ).fetchone()
+        if not row or time.time() - row[1] > max_age_s:
+            return None
+        return orjson.loads(row[0])
+    except Exception as e:
+        log.warning("URL cache read failed: %s", e)
+        return None
+
+
+def put_cached_url(namespace: str, url: str, result: dict):
+    if not PDF_CACHE_PATH or not url:
+        return
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO url_addr (namespace, url, result, fetched_at) VALUES (?, ?, ?, ?)",
+                (namespace, url, orjson.dumps(result).decode(), time.time()),
+            )
+            conn.commit()
+    except Exception as e:
+        log.warning("URL cache write failed: %s", e)
@@ -0,0 +1,66 @@
+import atexit
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Extração de texto/OCR do PDF é CPU pura e segura o GIL; em processos
+# separados ela escala com os cores. PDF_PROCESS_WORKERS=0 roda inline.
+PDF_PROCESS_WORKERS = int(os.getenv("PDF_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_lock = threading.Lock()
+_pool = None
+
+
+def get_pdf_pool():
+    global _pool
+    if PDF_PROCESS_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                # spawn: o processo pai tem threads do Playwright e locks do
+                # PDFium, que não sobrevivem bem a um fork.
+                _pool = ProcessPoolExecutor(
+                    max_workers=PDF_PROCESS_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _import_modules(*module_names: str):
+    for name in module_names:
+        importlib.import_module(name)
+
+
+def warm_pdf_pool(*module_names: str):
+    """
+    Sobe os processos do pool e importa neles o adapter e as libs de PDF sem
+    esperar: o spawn e o import (pytesseract, pypdfium2, ...) correm junto com
+    o bootstrap do browser em vez de cair no primeiro PDF.
+    """
+    pool = get_pdf_pool()
+    if pool is None:
+        return
+    for _ in range(PDF_PROCESS_WORKERS):
+        pool.submit(_import_modules, *module_names)
+
+
+def run_in_pdf_process(fn, *args):
+    """Roda fn(*args) num processo do pool (fn precisa ser de módulo)."""
+    pool = get_pdf_pool()
+    if pool is None:
+        return fn(*args)
+    return pool.submit(fn, *args).result()
+
+
+def shutdown_pdf_pool():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_pdf_pool)
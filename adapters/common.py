@@ -0,0 +1,127 @@
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+import orjson
+
+# Helpers que eram copiados em cada adapter. Tudo o que é igual entre
+# counties mora aqui; o que é específico (listas de campos, seletores) fica
+# no adapter e é passado como parâmetro.
+
+WS_RE = re.compile(r"\s+")
+NON_MONEY_CHARS_RE = re.compile(r"[^\d.]")
+
+# "$", "," e espaço saem num único translate; o regex só roda quando sobra
+# algo além de dígitos e ponto.
+MONEY_STRIP_TABLE = str.maketrans("", "", "$, ")
+
+NULL_SALE_DATE_VALUES = ("null", "none", "n/a", "na", "not assigned")
+
+DEFAULT_SCORE_FIELDS = (
+    "node",
+    "parcel_number",
+    "sale_date",
+    "address",
+    "city",
+    "state_address",
+    "zip",
+    "pdf_url",
+    "auction_source_url",
+    "opening_bid",
+    "deed_status",
+    "applicant_name",
+)
+
+DEFAULT_IMPORTANT_FIELDS = (
+    "address",
+    "city",
+    "state_address",
+    "zip",
+    "pdf_url",
+    "auction_source_url",
+    "opening_bid",
+    "deed_status",
+    "applicant_name",
+)
+
+
+def now_iso() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def clean_text(value):
+    if value is None:
+        return ""
+    return WS_RE.sub(" ", str(value)).strip()
+
+
+def money_digits(value) -> str:
+    """Só os dígitos e o ponto de um valor monetário: "$1,234.50" → "1234.50"."""
+    s = str(value).translate(MONEY_STRIP_TABLE)
+    if not s or s.replace(".", "").isdecimal():
+        return s
+    return NON_MONEY_CHARS_RE.sub("", s)
+
+
+@lru_cache(maxsize=1024)
+def normalize_sale_date_value(value: Optional[str]) -> Optional[str]:
+    v = clean_text(value or "")
+    if not v:
+        return None
+    if v.lower() in NULL_SALE_DATE_VALUES:
+        return None
+    return v
+
+
+def payload_quality_score(payload: dict, fields=DEFAULT_SCORE_FIELDS) -> int:
+    return sum(1 for f in fields if payload.get(f) not in (None, "", [], {}))
+
+
+def payload_is_better_than_existing(
+    payload: dict,
+    existing: dict,
+    score_fields=DEFAULT_SCORE_FIELDS,
+    important_fields=DEFAULT_IMPORTANT_FIELDS,
+) -> bool:
+    new_score = payload_quality_score(payload, score_fields)
+    old_score = payload_quality_score(existing, score_fields)
+
+    if new_score > old_score:
+        return True
+
+    for f in important_fields:
+        old_val = clean_text(existing.get(f))
+        new_val = clean_text(payload.get(f))
+        if not old_val and new_val:
+            return True
+
+    return False
+
+
+def dumps_text(obj, indent: bool = False) -> str:
+    """JSON para log/print via orjson; chaves não-string viram texto em vez de erro."""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, option=option).decode()
+
+
+def shared_feed(items):
+    """
+    Fila única para os workers de um county: cada um puxa o próximo item
+    quando termina o atual, em vez de receber uma fatia fixa — um worker que
+    só pega itens rápidos não fica ocioso enquanto outro acumula os lentos.
+    Devolve uma fábrica; cada worker itera o seu feed().
+    """
+    lock = threading.Lock()
+    it = iter(items)
+
+    def feed():
+        while True:
+            with lock:
+                item = next(it, None)
+            if item is None:
+                return
+            yield item
+
+    return feed
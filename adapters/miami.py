@@ -1,13 +1,24 @@
-import json
 import logging
 import os
 import re
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 from urllib.parse import quote
 
-import requests
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from adapters._browser import LEAN_CHROMIUM_ARGS, get_browser, close_browsers, resource_blocker, wait_for_selector_quiet
+from adapters._http import delete_nodes_in_batches, get_session, response_json, supabase_headers
+from adapters.common import (
+    WS_RE,
+    clean_text,
+    dumps_text,
+    money_digits,
+    normalize_sale_date_value,
+    now_iso,
+    payload_is_better_than_existing,
+    shared_feed,
+)
 
 log = logging.getLogger("miami")
 
@@ -17,6 +28,10 @@ AUCTION_URL = "https://www.miamidade.realforeclose.com/index.cfm"
 
 HEADLESS = os.getenv("HEADLESS", "true").lower() == "true"
 MAX_LOTS = int(os.getenv("MAX_LOTS", "1000"))
+DETAIL_WORKERS = int(os.getenv("MIAMI_DETAIL_WORKERS", "1"))
+# Depois de N cases abertos a aba é trocada por uma nova no mesmo context:
+# o renderer antigo (e o heap acumulado) é liberado, cookies/filtro ficam.
+RECYCLE_PAGE_EVERY = int(os.getenv("MIAMI_RECYCLE_PAGE_EVERY", "40"))
 
 APP_API_BASE = (os.getenv("APP_API_BASE", "") or "").strip().rstrip("/")
 APP_API_TOKEN = (os.getenv("APP_API_TOKEN", "") or "").strip()
@@ -30,22 +45,32 @@ PAGINATION_DIAGNOSTIC_MODE = os.getenv("MIAMI_PAGINATION_DIAGNOSTIC_MODE", "fals
 
 
 # =========================
-# BASIC HELPERS
+# REGEX
 # =========================
-def now_iso() -> str:
-    return datetime.utcnow().isoformat()
+# Compilados uma vez: rodam para cada case aberto.
+MONEY_RE = re.compile(r"\$[\d,]+(?:\.\d{2})?")
+REDEMPTION_AMOUNT_RE = re.compile(r"Redemption Amount:\s*(\$[\d,]+(?:\.\d{2})?)")
+OPENING_BID_RE = re.compile(r"Opening Bid:\s*(\$[\d,]+(?:\.\d{2})?)")
+CASE_ADDRESS_RE = re.compile(r"^(.*?),\s*([A-Z][A-Z .]+),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)$", re.I)
 
 
-def clean_text(value):
-    if value is None:
-        return ""
-    return re.sub(r"\s+", " ", str(value)).strip()
+# =========================
+# SELECTORS
+# =========================
+# Elementos que sinalizam que a etapa seguinte pode começar (no lugar de
+# sleeps fixos).
+CASE_ROW_SELECTOR = "tr.load-case.table-row.link[data-caseid]"
+FILTERS_READY_SELECTOR = "a.filters-reset"
+STATUS_OPTION_SELECTOR = 'a[data-statusid="192"][data-parentid="2"]'
 
 
+# =========================
+# BASIC HELPERS
+# =========================
 def clean_multiline(value):
     if value is None:
         return ""
-    lines = [re.sub(r"\s+", " ", x).strip(" ,") for x in str(value).splitlines()]
+    lines = [WS_RE.sub(" ", x).strip(" ,") for x in str(value).splitlines()]
     lines = [x for x in lines if x]
     return ", ".join(lines)
 
@@ -53,14 +78,15 @@ def clean_multiline(value):
 def money_from_text(text: str) -> str:
     if not text:
         return ""
-    m = re.search(r"\$[\d,]+(?:\.\d{2})?", text)
+    m = MONEY_RE.search(text)
     return m.group(0) if m else ""
 
 
+@lru_cache(maxsize=1024)
 def normalize_money(value: str) -> Optional[float]:
     if not value:
         return None
-    raw = re.sub(r"[^\d.]", "", str(value))
+    raw = money_digits(value)
     if not raw:
         return None
     try:
@@ -69,61 +95,6 @@ def normalize_money(value: str) -> Optional[float]:
         return None
 
 
-def normalize_sale_date_value(value: str) -> Optional[str]:
-    v = clean_text(value or "")
-    if not v:
-        return None
-    if v.lower() in ("not assigned", "null", "none", "n/a", "na"):
-        return None
-    return v
-
-
-def payload_quality_score(payload: dict) -> int:
-    fields = [
-        "node",
-        "parcel_number",
-        "sale_date",
-        "address",
-        "city",
-        "state_address",
-        "zip",
-        "pdf_url",
-        "auction_source_url",
-        "opening_bid",
-        "deed_status",
-        "applicant_name",
-    ]
-    return sum(1 for f in fields if payload.get(f) not in (None, "", [], {}))
-
-
-def payload_is_better_than_existing(payload: dict, existing: dict) -> bool:
-    new_score = payload_quality_score(payload)
-    old_score = payload_quality_score(existing)
-
-    if new_score > old_score:
-        return True
-
-    important_fields = [
-        "address",
-        "city",
-        "state_address",
-        "zip",
-        "pdf_url",
-        "auction_source_url",
-        "opening_bid",
-        "deed_status",
-        "applicant_name",
-    ]
-
-    for f in important_fields:
-        old_val = clean_text(existing.get(f) or "")
-        new_val = clean_text(payload.get(f) or "")
-        if not old_val and new_val:
-            return True
-
-    return False
-
-
 def record_needs_enrichment(existing: dict) -> bool:
     important_fields = [
         "pdf_url",
@@ -148,7 +119,7 @@ def send_to_app(payload: dict) -> bool:
         return True
 
     try:
-        r = requests.post(
+        r = get_session().post(
             f"{APP_API_BASE}/api/ingest",
             json=payload,
             headers={"Authorization": f"Bearer {APP_API_TOKEN}"},
@@ -167,11 +138,7 @@ def send_to_app(payload: dict) -> bool:
 # SUPABASE
 # =========================
 def sb_headers():
-    return {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-    }
+    return supabase_headers(SUPABASE_SERVICE_ROLE_KEY)
 
 
 def supabase_fetch_all_miami_records() -> List[dict]:
@@ -193,12 +160,12 @@ def supabase_fetch_all_miami_records() -> List[dict]:
         )
 
         try:
-            r = requests.get(url, headers=sb_headers(), timeout=60)
+            r = get_session().get(url, headers=sb_headers(), timeout=60)
             if r.status_code != 200:
                 log.warning("supabase_fetch_all_miami_records failed status=%s body=%s", r.status_code, r.text[:500])
                 break
 
-            arr = r.json() or []
+            arr = response_json(r) or []
             if not arr:
                 break
 
@@ -259,7 +226,7 @@ def supabase_update_sale_date(record_id: str, sale_date: Optional[str]) -> dict:
     }
 
     try:
-        r = requests.patch(url, headers=headers, json=payload, timeout=20)
+        r = get_session().patch(url, headers=headers, json=payload, timeout=20)
         ok = r.status_code in (200, 204)
 
         if ok:
@@ -309,12 +276,12 @@ def supabase_insert_property(payload: dict) -> dict:
     headers["Prefer"] = "return=representation"
 
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=30)
+        r = get_session().post(url, headers=headers, json=payload, timeout=30)
         ok = r.status_code in (200, 201)
 
         record_id = None
         try:
-            body = r.json()
+            body = response_json(r)
             if isinstance(body, list) and body:
                 record_id = body[0].get("id")
         except Exception:
@@ -363,7 +330,7 @@ def supabase_update_property(record_id: str, payload: dict) -> dict:
     headers["Prefer"] = "return=representation"
 
     try:
-        r = requests.patch(url, headers=headers, json=payload, timeout=30)
+        r = get_session().patch(url, headers=headers, json=payload, timeout=30)
         ok = r.status_code in (200, 204)
 
         if ok:
@@ -418,7 +385,7 @@ def supabase_list_all_nodes() -> List[str]:
                 f"&limit={page_size}"
             )
 
-            r = requests.get(url, headers=sb_headers(), timeout=60)
+            r = get_session().get(url, headers=sb_headers(), timeout=60)
 
             if r.status_code != 200:
                 log.warning(
@@ -428,7 +395,7 @@ def supabase_list_all_nodes() -> List[str]:
                 )
                 break
 
-            arr = r.json() or []
+            arr = response_json(r) or []
             if not arr:
                 break
 
@@ -464,36 +431,7 @@ def supabase_delete_nodes(nodes: List[str]) -> Dict:
             "reason": "no nodes to delete",
         }
 
-    deleted_count = 0
-    errors = []
-    batch_size = 100
-
-    for i in range(0, len(nodes), batch_size):
-        batch = nodes[i:i + batch_size]
-
-        try:
-            in_clause = ",".join(f'"{quote(node, safe="")}"' for node in batch)
-
-            url = (
-                f"{SUPABASE_URL}/rest/v1/properties"
-                f"?county=eq.Miami-Dade"
-                f"&node=in.({in_clause})"
-            )
-
-            r = requests.delete(url, headers=sb_headers(), timeout=60)
-
-            if r.status_code in (200, 204):
-                deleted_count += len(batch)
-                log.info("SUPABASE DELETE batch ok count=%s", len(batch))
-            else:
-                msg = f"status={r.status_code} body={r.text[:500]}"
-                errors.append(msg)
-                log.warning("SUPABASE DELETE batch failed: %s", msg)
-
-        except Exception as e:
-            msg = str(e)
-            errors.append(msg)
-            log.warning("SUPABASE DELETE batch exception: %s", msg)
+    deleted_count, errors = delete_nodes_in_batches(SUPABASE_URL, sb_headers(), "Miami-Dade", nodes)
 
     return {
         "executed": True,
@@ -688,17 +626,13 @@ def get_filter_state(page):
 
 def wait_for_case_rows(page, timeout_ms=25000):
     log.info("Waiting for Miami search results...")
-    waited = 0
-    step = 1000
-    while waited < timeout_ms:
-        rows = page.locator('tr.load-case.table-row.link[data-caseid]').count()
-        if rows > 0:
-            log.info("Rows after search: %s", rows)
-            return rows
-        page.wait_for_timeout(step)
-        waited += step
+    # Espera pelo evento (linha anexada ao DOM) em vez de poll de 1s.
+    if not wait_for_selector_quiet(page, CASE_ROW_SELECTOR, timeout_ms, state="attached"):
+        raise RuntimeError("No case rows found after Miami search")
 
-    raise RuntimeError("No case rows found after Miami search")
+    rows = page.locator(CASE_ROW_SELECTOR).count()
+    log.info("Rows after search: %s", rows)
+    return rows
 
 
 def click_search_button(page) -> bool:
@@ -790,13 +724,12 @@ def run_search_flow(page):
 
     if not click_safe(page, "#filterButtonStatus", "FILTER BUTTON"):
         raise RuntimeError("Could not open filter button")
-    page.wait_for_timeout(1000)
+    wait_for_selector_quiet(page, STATUS_OPTION_SELECTOR, 10000, state="attached")
 
+    # Os dois passos abaixo mexem no DOM de forma síncrona (evaluate): não
+    # há o que esperar entre eles.
     force_clear_all_active_statuses(page)
-    page.wait_for_timeout(400)
-
     force_select_only_192(page)
-    page.wait_for_timeout(800)
 
     state = get_filter_state(page)
     log.info("SEARCH STATE BEFORE SUBMIT: %s", state)
@@ -809,10 +742,34 @@ def run_search_flow(page):
 
 def open_list_and_apply_filter(page):
     page.goto(LIST_URL, wait_until="domcontentloaded", timeout=60000)
-    page.wait_for_timeout(6000)
+    wait_for_selector_quiet(page, FILTERS_READY_SELECTOR, 20000)
     run_search_flow(page)
 
 
+def return_to_results(page, results_url: str, page_num: int) -> bool:
+    """
+    Volta para a página page_num da lista depois de abrir um case.
+    Primeiro tenta a URL dos resultados capturada antes do clique (o filtro
+    fica na sessão do site); só refaz reset + filtro + busca se ela não
+    voltar com o filtro ACTIVE aplicado.
+    """
+    if results_url:
+        try:
+            page.goto(results_url, wait_until="domcontentloaded", timeout=60000)
+            wait_for_case_rows(page, timeout_ms=10000)
+            if get_filter_state(page).get("hidden_filterCaseStatus") == "192":
+                if page_num <= 1 or go_to_page_number(page, page_num):
+                    return True
+            log.info("Results URL came back without the ACTIVE filter/page; re-running search")
+        except Exception as e:
+            log.info("Direct return to results failed (%s); re-running search", e)
+
+    open_list_and_apply_filter(page)
+    if page_num > 1:
+        return go_to_page_number(page, page_num)
+    return True
+
+
 # =========================
 # PAGINATION
 # =========================
@@ -865,18 +822,90 @@ def get_active_page_number(page) -> int:
         return 1
 
 
+# Coluna da lista de cases -> campo, pelo texto do cabeçalho. A ordem importa:
+# "Case Status" é status (não case_number) e "Sale Date" é sale_date (não
+# date_created); cada cabeçalho fica com o primeiro campo livre que casar.
+LIST_COLUMN_PATTERNS = (
+    ("application_number", re.compile(r"applica", re.I)),
+    ("parcel_number", re.compile(r"parcel|folio", re.I)),
+    ("sale_date", re.compile(r"sale|auction", re.I)),
+    ("status", re.compile(r"status", re.I)),
+    ("case_number", re.compile(r"case", re.I)),
+    ("date_created", re.compile(r"creat|date", re.I)),
+)
+# Sem estas colunas o FAST SKIP / SALE_DATE ONLY não tem base para decidir.
+REQUIRED_LIST_COLUMNS = ("case_number", "parcel_number", "sale_date")
+
+
+def resolve_list_columns(headers: List[str]) -> Optional[Dict[str, int]]:
+    """Índice de cada campo pelo cabeçalho; None se faltar coluna obrigatória."""
+    columns: Dict[str, int] = {}
+    for idx, header in enumerate(headers):
+        text = clean_text(header)
+        if not text:
+            continue
+        for field, pattern in LIST_COLUMN_PATTERNS:
+            if field not in columns and pattern.search(text):
+                columns[field] = idx
+                break
+
+    if not all(field in columns for field in REQUIRED_LIST_COLUMNS):
+        return None
+    return columns
+
+
+def row_fields_from_cells(cells: List[str], headers: List[str], columns: Optional[Dict[str, int]]) -> Dict:
+    """
+    Campos da linha pelas colunas resolvidas. Vazio (fail closed: o case vai
+    para o detalhe) se o cabeçalho não foi reconhecido ou a linha não tem o
+    mesmo número de células que ele.
+    """
+    if columns is None or len(cells) != len(headers):
+        return {}
+    return {field: clean_text(cells[idx]) for field, idx in columns.items()}
+
+
 def collect_case_rows(page) -> List[Dict]:
-    rows = page.locator('tr.load-case.table-row.link[data-caseid]')
-    count = rows.count()
-    log.info("Collecting case rows from current page: %s", count)
+    # Um único evaluate traz caseid, texto, as células de cada linha (vazias
+    # no lugar) e o cabeçalho da tabela, que decide qual célula é qual campo.
+    data = page.evaluate(
+        """
+        () => {
+            const txt = c => (c.innerText || '').replace(/\\s+/g, ' ').trim();
+            const rows = Array.from(document.querySelectorAll('tr.load-case.table-row.link[data-caseid]'));
+            const table = rows.length ? rows[0].closest('table') : null;
+            let headerCells = [];
+            if (table) {
+                const headRow = (table.tHead && table.tHead.rows[0])
+                    || Array.from(table.rows).find(r => r.querySelector('th'));
+                if (headRow) headerCells = Array.from(headRow.cells);
+            }
+            return {
+                headers: headerCells.map(txt),
+                rows: rows.map(r => ({
+                    caseid: r.getAttribute('data-caseid') || '',
+                    text: r.innerText || '',
+                    cells: Array.from(r.cells).map(txt),
+                })),
+            };
+        }
+        """
+    )
+    rows = data.get("rows") or []
+    headers = data.get("headers") or []
+    log.info("Collecting case rows from current page: %s", len(rows))
+
+    columns = resolve_list_columns(headers)
+    if rows and columns is None:
+        log.warning("Miami list header not recognized (%s); every row goes to the detail page", headers)
 
     items = []
-    for i in range(count):
-        row = rows.nth(i)
+    for i, row in enumerate(rows):
         items.append({
             "index": i,
-            "caseid": row.get_attribute("data-caseid") or "",
-            "row_text": clean_text(row.inner_text()),
+            "caseid": row.get("caseid") or "",
+            "row_text": clean_text(row.get("text")),
+            "fields": row_fields_from_cells(row.get("cells") or [], headers, columns),
         })
     return items
 
@@ -927,20 +956,18 @@ def parse_total_items(page) -> int:
 
 def get_first_caseid(page) -> str:
     try:
-        row = page.locator('tr.load-case.table-row.link[data-caseid]').first
-        if row.count() == 0:
-            return ""
-        return row.get_attribute("data-caseid") or ""
+        return page.evaluate(
+            "() => document.querySelector('tr.load-case.table-row.link[data-caseid]')?.getAttribute('data-caseid') || ''"
+        )
     except Exception:
         return ""
 
 
 def get_first_row_text(page) -> str:
     try:
-        row = page.locator('tr.load-case.table-row.link[data-caseid]').first
-        if row.count() == 0:
-            return ""
-        return clean_text(row.inner_text())
+        return clean_text(page.evaluate(
+            "() => document.querySelector('tr.load-case.table-row.link[data-caseid]')?.innerText || ''"
+        ))
     except Exception:
         return ""
 
@@ -952,8 +979,9 @@ def wait_for_page_change(
     old_first_row_text: str = "",
     timeout_ms: int = 22000,
 ) -> bool:
+    # Poll curto: a troca costuma chegar bem antes de 1s.
     waited = 0
-    step = 1000
+    step = 250
 
     while waited < timeout_ms:
         try:
@@ -966,7 +994,15 @@ def wait_for_page_change(
             first_case_changed = bool(old_first_caseid and new_first_caseid and new_first_caseid != old_first_caseid)
             first_text_changed = bool(old_first_row_text and new_first_row_text and new_first_row_text != old_first_row_text)
 
-            if page_changed or first_case_changed or first_text_changed:
+            # Com a primeira linha antiga conhecida, só o número da página não
+            # basta: o "Page N / M" pode trocar com as linhas antigas ainda na
+            # tela, e collect_case_rows leria a página anterior de novo.
+            if old_first_caseid or old_first_row_text:
+                changed = first_case_changed or first_text_changed
+            else:
+                changed = page_changed
+
+            if changed:
                 log.info(
                     "Miami page changed successfully: old_page=%s new_page=%s old_caseid=%s new_caseid=%s",
                     old_page,
@@ -1306,7 +1342,7 @@ def log_pagination_diagnostics(page):
             }
             """
         )
-        log.info("PAGINATION DIAGNOSTICS: %s", json.dumps(data))
+        log.info("PAGINATION DIAGNOSTICS: %s", dumps_text(data))
     except Exception as e:
         log.warning("Could not collect pagination diagnostics: %s", str(e))
 
@@ -1335,13 +1371,13 @@ def go_to_page_number(page, page_num: int) -> bool:
         if PAGINATION_DIAGNOSTIC_MODE and attempt == 1:
             log_pagination_diagnostics(page)
 
+        # Os clicks só devolvem True depois de wait_for_page_change confirmar
+        # a troca de página: não há o que esperar a mais.
         if click_page_option_direct_without_dropdown(page, page_num):
-            page.wait_for_timeout(1200)
             return True
 
         if open_pager_dropdown(page):
             if click_page_option_from_dropdown(page, page_num):
-                page.wait_for_timeout(1200)
                 return True
         else:
             log.warning("Could not open pager dropdown on attempt %s", attempt)
@@ -1349,7 +1385,6 @@ def go_to_page_number(page, page_num: int) -> bool:
         current = get_active_page_number(page)
         if page_num == current + 1:
             if click_next_page(page):
-                page.wait_for_timeout(1200)
                 return True
 
         page.wait_for_timeout(1000)
@@ -1361,80 +1396,83 @@ def go_to_page_number(page, page_num: int) -> bool:
 # =========================
 # DETAIL PARSING
 # =========================
-def parse_row_text(row_text: str) -> Dict:
-    parts = re.split(r"\s{2,}|\t", row_text)
-    parts = [clean_text(x) for x in parts if clean_text(x)]
-    payload = {
-        "status": parts[0] if len(parts) > 0 else "",
-        "case_number": parts[1] if len(parts) > 1 else "",
-        "date_created": parts[2] if len(parts) > 2 else "",
-        "application_number": parts[3] if len(parts) > 3 else "",
-        "parcel_number": parts[4] if len(parts) > 4 else "",
-        "sale_date": parts[5] if len(parts) > 5 else "",
-    }
-    return payload
-
-
-def open_case_by_caseid(page, caseid: str) -> Dict:
-    rows = page.locator(f'tr.load-case.table-row.link[data-caseid="{caseid}"]')
-    count = rows.count()
-    if count == 0:
-        raise RuntimeError(f"Case row not found for caseid={caseid}")
-
-    row = rows.first
-    row_text = clean_text(row.inner_text())
-
-    handle = row.element_handle()
+def open_case_by_caseid(page, case_row: Dict) -> Dict:
+    # case_row vem de collect_case_rows: texto e campos da linha já lidos.
+    caseid = case_row["caseid"]
+    handle = page.query_selector(f'tr.load-case.table-row.link[data-caseid="{caseid}"]')
     if handle is None:
-        raise RuntimeError(f"Could not get handle for case row {caseid}")
+        raise RuntimeError(f"Case row not found for caseid={caseid}")
 
     if not click_element_handle_safe(handle, page, f"CASE ROW {caseid}"):
         raise RuntimeError(f"Could not open case detail for caseid {caseid}")
 
     log.info("Waiting for case detail to load...")
-    page.wait_for_timeout(7000)
-
-    try:
-        page.wait_for_selector("text=CASE SUMMARY", timeout=15000)
-    except PlaywrightTimeoutError:
+    # O título CASE SUMMARY já marca o detalhe carregado; o sleep fixo de 7s
+    # antes dele só somava tempo ocioso por case.
+    if not wait_for_selector_quiet(page, "text=CASE SUMMARY", 20000):
         log.warning("CASE SUMMARY title not found; continuing with DOM parse attempt")
 
-    return {"caseid": caseid, "row_text": row_text}
+    return {
+        "caseid": caseid,
+        "row_text": case_row.get("row_text", ""),
+        "row_fields": case_row.get("fields") or {},
+    }
 
 
-def parse_case_header(page):
-    data = page.evaluate(
+CASE_PAGE_LABELS = {
+    "tax_collector_number": "Tax Collector #",
+    "applicant_number": "Applicant Number",
+    "case_number": "Case Number",
+    "parcel_number": "Parcel Number",
+    "case_status": "Case Status",
+    "app_receive_date": "App Receive Date",
+    "sale_date": "Sale Date",
+    "publish_dates": "Publish Date(s)",
+    "property_address": "Property Address",
+    "homestead": "Homestead",
+    "legal_description": "Legal Description",
+}
+
+
+def sweep_case_page(page) -> Dict:
+    # Uma única passada no DOM para header + summary: antes eram dois
+    # page.evaluate e cada label varria a página inteira de novo.
+    return page.evaluate(
         """
-        () => {
+        (labels) => {
             const bodyText = document.body.innerText || '';
-
-            function byLabel(label) {
-                const nodes = Array.from(document.querySelectorAll('body *'));
-                for (const node of nodes) {
-                    const txt = (node.innerText || '').trim();
-                    if (txt === label) {
-                        const parent = node.parentElement;
-                        if (parent) {
-                            const parentText = (parent.innerText || '').trim();
-                            if (parentText && parentText !== label) {
-                                return parentText.replace(label, '').trim();
-                            }
-                        }
-                        const next = node.nextElementSibling;
-                        if (next) return (next.innerText || '').trim();
-                    }
+            const wanted = new Map(Object.entries(labels).map(([key, label]) => [label, key]));
+            const fields = {};
+            for (const key of Object.keys(labels)) fields[key] = '';
+
+            let pending = wanted.size;
+            for (const node of document.querySelectorAll('body *')) {
+                if (!pending) break;
+                const txt = (node.innerText || '').trim();
+                const key = wanted.get(txt);
+                if (key === undefined) continue;
+
+                let value = '';
+                const parent = node.parentElement;
+                const parentText = parent ? (parent.innerText || '').trim() : '';
+                if (parentText && parentText !== txt) {
+                    value = parentText.replace(txt, '').trim();
+                } else if (node.nextElementSibling) {
+                    value = (node.nextElementSibling.innerText || '').trim();
                 }
-                return '';
+
+                // Label só sai da busca com valor: um nó vazio não encerra,
+                // as ocorrências seguintes ainda são testadas.
+                if (!value) continue;
+                fields[key] = value;
+                wanted.delete(txt);
+                pending--;
             }
 
             const parcelLink = document.querySelector('#propertyAppraiserLink');
 
             return {
-                tax_collector_number: byLabel('Tax Collector #'),
-                applicant_number: byLabel('Applicant Number'),
-                case_number: byLabel('Case Number'),
-                parcel_number: byLabel('Parcel Number') || (parcelLink ? (parcelLink.innerText || '').trim() : ''),
-                case_status: byLabel('Case Status'),
+                fields,
                 raw_body: bodyText,
                 parcel_link: parcelLink ? {
                     text: (parcelLink.innerText || '').trim(),
@@ -1442,61 +1480,46 @@ def parse_case_header(page):
                 } : null
             };
         }
-        """
+        """,
+        CASE_PAGE_LABELS,
     )
 
+
+def parse_case_header(sweep: Dict) -> Dict:
+    fields = sweep.get("fields", {})
+    parcel_link = sweep.get("parcel_link")
+
+    data = {
+        "tax_collector_number": fields.get("tax_collector_number", ""),
+        "applicant_number": fields.get("applicant_number", ""),
+        "case_number": fields.get("case_number", ""),
+        "parcel_number": fields.get("parcel_number", "") or (parcel_link or {}).get("text", ""),
+        "case_status": fields.get("case_status", ""),
+        "raw_body": sweep.get("raw_body", ""),
+        "parcel_link": parcel_link,
+    }
+
     raw_body = data.get("raw_body", "")
-    data["redemption_amount"] = money_from_text(
-        re.search(r"Redemption Amount:\s*(\$[\d,]+(?:\.\d{2})?)", raw_body).group(0)
-        if re.search(r"Redemption Amount:\s*(\$[\d,]+(?:\.\d{2})?)", raw_body) else ""
-    )
-    if data["redemption_amount"]:
-        data["redemption_amount"] = re.search(r"\$[\d,]+(?:\.\d{2})?", data["redemption_amount"]).group(0)
+    m = REDEMPTION_AMOUNT_RE.search(raw_body)
+    data["redemption_amount"] = m.group(1) if m else ""
 
-    data["opening_bid"] = money_from_text(
-        re.search(r"Opening Bid:\s*(\$[\d,]+(?:\.\d{2})?)", raw_body).group(0)
-        if re.search(r"Opening Bid:\s*(\$[\d,]+(?:\.\d{2})?)", raw_body) else ""
-    )
-    if data["opening_bid"]:
-        data["opening_bid"] = re.search(r"\$[\d,]+(?:\.\d{2})?", data["opening_bid"]).group(0)
+    m = OPENING_BID_RE.search(raw_body)
+    data["opening_bid"] = m.group(1) if m else ""
 
     return data
 
 
-def parse_case_summary(page):
-    data = page.evaluate(
-        """
-        () => {
-            function byLabel(label) {
-                const nodes = Array.from(document.querySelectorAll('body *'));
-                for (const node of nodes) {
-                    const txt = (node.innerText || '').trim();
-                    if (txt === label) {
-                        const parent = node.parentElement;
-                        if (parent) {
-                            const parentText = (parent.innerText || '').trim();
-                            if (parentText && parentText !== label) {
-                                return parentText.replace(label, '').trim();
-                            }
-                        }
-                        const next = node.nextElementSibling;
-                        if (next) return (next.innerText || '').trim();
-                    }
-                }
-                return '';
-            }
+def parse_case_summary(sweep: Dict) -> Dict:
+    fields = sweep.get("fields", {})
 
-            return {
-                app_receive_date: byLabel('App Receive Date'),
-                sale_date: byLabel('Sale Date'),
-                publish_dates: byLabel('Publish Date(s)'),
-                property_address: byLabel('Property Address'),
-                homestead: byLabel('Homestead'),
-                legal_description: byLabel('Legal Description')
-            };
-        }
-        """
-    )
+    data = {
+        "app_receive_date": fields.get("app_receive_date", ""),
+        "sale_date": fields.get("sale_date", ""),
+        "publish_dates": fields.get("publish_dates", ""),
+        "property_address": fields.get("property_address", ""),
+        "homestead": fields.get("homestead", ""),
+        "legal_description": fields.get("legal_description", ""),
+    }
 
     data["property_address"] = clean_multiline(data.get("property_address", ""))
     pub = data.get("publish_dates", "")
@@ -1509,8 +1532,9 @@ def parse_case_summary(page):
 
 
 def extract_case_detail(page, base_case: Dict) -> Dict:
-    header_data = parse_case_header(page)
-    summary_data = parse_case_summary(page)
+    sweep = sweep_case_page(page)
+    header_data = parse_case_header(sweep)
+    summary_data = parse_case_summary(sweep)
 
     detail = {
         **base_case,
@@ -1528,12 +1552,12 @@ def extract_case_detail(page, base_case: Dict) -> Dict:
         "has_case_summary": "CASE SUMMARY" in header_data.get("raw_body", ""),
     }
 
-    log.info("CASE DETAIL EXTRACTED: %s", json.dumps(detail, indent=2))
+    log.info("CASE DETAIL EXTRACTED: %s", dumps_text(detail, indent=True))
     return detail
 
 
 def build_final_record(case_detail: Dict) -> Dict:
-    row_parsed = parse_row_text(case_detail.get("row_text", ""))
+    row_parsed = case_detail.get("row_fields") or {}
     header = case_detail.get("header", {})
     summary = case_detail.get("case_summary", {})
     parcel = case_detail.get("parcel_link", {}) or {}
@@ -1576,7 +1600,7 @@ def build_properties_payload(record: dict) -> dict:
     state_address = None
     zip_code = None
 
-    m = re.search(r"^(.*?),\s*([A-Z][A-Z .]+),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)$", addr_full, re.I)
+    m = CASE_ADDRESS_RE.search(addr_full)
     if m:
         address_only = clean_text(m.group(1))
         city = clean_text(m.group(2)).title()
@@ -1635,63 +1659,166 @@ def build_index_record(existing_id: Optional[str], payload: dict) -> dict:
 
 
 # =========================
-# MAIN
+# BROWSER SESSION
 # =========================
-def run_miami():
-    log.info("=== MIAMI FINAL OPERATIONAL V8 + STANDARDIZED SAVE FLOW + SAFE DELETE ===")
+MIAMI_LAUNCH_OPTIONS = {
+    "channel": "chrome",
+    "headless": HEADLESS,
+    "args": LEAN_CHROMIUM_ARGS,
+}
+
+
+def new_miami_context():
+    browser = get_browser(**MIAMI_LAUNCH_OPTIONS)
+    context = browser.new_context(
+        user_agent=(
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/134.0.0.0 Safari/537.36"
+        ),
+        viewport={"width": 1366, "height": 900},
+        locale="en-US",
+        timezone_id="America/New_York",
+    )
+    # CSS fica: os cliques do pager/filtro checam visibilidade.
+    context.route("**/*", resource_blocker())
+    return context
+
+
+def recycle_page(page, page_num: int):
+    """
+    Abre outra aba no mesmo context, já de volta em page_num, e só então
+    fecha a antiga. Se a volta falhar, a aba nova é fechada e a antiga segue
+    valendo para o caller.
+    """
+    results_url = page.url
+    new_page = page.context.new_page()
+    try:
+        if not return_to_results(new_page, results_url, page_num):
+            raise RuntimeError(f"Could not return to page {page_num} after recycling the page")
+    except Exception:
+        try:
+            new_page.close()
+        except Exception:
+            pass
+        raise
 
-    supabase_rows = supabase_fetch_all_miami_records() if CAN_CHECK_SUPABASE else []
-    indexes = build_supabase_indexes(supabase_rows)
+    try:
+        page.close()
+    except Exception:
+        pass
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            channel="chrome",
-            headless=HEADLESS,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-            ],
-        )
+    log.info("Recycled Miami page (fresh renderer) at page %s", page_num)
+    return new_page
 
-        context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/134.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1366, "height": 900},
-            locale="en-US",
-            timezone_id="America/New_York",
+
+def claim_row(budget: dict) -> Optional[int]:
+    """Reserva uma linha do MAX_LOTS compartilhado entre workers."""
+    with budget["lock"]:
+        if budget["used"] >= MAX_LOTS:
+            return None
+        budget["used"] += 1
+        return budget["used"]
+
+
+# =========================
+# PAGE WORKER
+# =========================
+def save_case_payload(prop_payload: dict, existing: Optional[dict], indexes: dict) -> dict:
+    """
+    Grava o case no Supabase, atualiza os índices e manda para o app.
+    Roda na thread de escrita de process_page_batch, em paralelo com o browser.
+    """
+    sb_result = supabase_save_property(prop_payload, existing)
+
+    if sb_result.get("sent"):
+        record_id = sb_result.get("record_id") or (existing.get("id") if existing else None)
+        idx_record = build_index_record(record_id, prop_payload)
+
+        node_key = clean_text(prop_payload.get("node") or "")
+        tax_sale_key = clean_text(prop_payload.get("tax_sale_id") or "")
+        parcel_key = clean_text(prop_payload.get("parcel_number") or "")
+
+        if node_key:
+            indexes["by_node"][node_key] = idx_record
+        if tax_sale_key and parcel_key:
+            indexes["by_tax_sale_parcel"][(tax_sale_key, parcel_key)] = idx_record
+
+        send_to_app(prop_payload)
+
+    return {
+        "node": prop_payload.get("node"),
+        "mode": "full_save",
+        **sb_result,
+    }
+
+
+def finish_case(case_detail: dict, indexes: dict) -> dict:
+    """
+    Monta o record e o payload do case lido e grava se ele for melhor que o
+    existente. Roda na thread de escrita de process_page_batch.
+    """
+    record = build_final_record(case_detail)
+    prop_payload = build_properties_payload(record)
+
+    existing = indexes["by_node"].get(prop_payload.get("node"))
+    if not existing:
+        key = (
+            clean_text(prop_payload.get("tax_sale_id") or ""),
+            clean_text(prop_payload.get("parcel_number") or ""),
         )
+        if key[0] and key[1]:
+            existing = indexes["by_tax_sale_parcel"].get(key)
 
-        page = context.new_page()
+    if existing and not payload_is_better_than_existing(prop_payload, existing):
+        is_inactive = existing.get("is_active") is False or clean_text(existing.get("removed_at") or "") != ""
+        if not is_inactive:
+            log.info("DETAIL READ but payload not better → skip save node=%s", prop_payload.get("node"))
+            return {"record": record, "save": None}
 
-        open_list_and_apply_filter(page)
+    return {"record": record, "save": save_case_payload(prop_payload, existing, indexes)}
 
-        expected_total_pages = parse_total_pages(page)
-        expected_total_items = parse_total_items(page)
-        summary = get_results_summary(page)
 
-        log.info("Detected total Miami pages: %s", expected_total_pages)
-        log.info("Detected total Miami items: %s", expected_total_items)
+def save_sale_date_only(existing: dict, caseid: str, sale_date: Optional[str]) -> dict:
+    update_result = supabase_update_sale_date(existing.get("id"), sale_date)
 
-        results = []
-        failures = []
-        supabase_results = []
+    if update_result.get("sent"):
+        existing["sale_date"] = sale_date
+        existing["is_active"] = True
+        existing["removed_at"] = None
 
-        total_processed_rows = 0
-        processed_pages = 0
-        completed_all_pages = False
-        can_delete_missing = False
-        seen_nodes_this_run = set()
+    return {
+        "node": caseid,
+        "mode": "update_sale_date_only",
+        **update_result,
+    }
 
-        skipped_fast_same_sale_date = 0
-        updated_sale_date_only = 0
-        opened_detail_count = 0
 
-        for page_num in range(1, expected_total_pages + 1):
-            if total_processed_rows >= MAX_LOTS:
+def process_page_batch(page, page_nums: Iterable[int], indexes: dict, budget: dict, worker_id: int = 0) -> dict:
+    """
+    Processa páginas da lista (lista ou o feed compartilhado) com uma sessão própria.
+    A página recebida já está com a busca aplicada (na página 1).
+    """
+    results = []
+    failures = []
+    supabase_results = []
+    seen_nodes = set()
+    processed_pages = 0
+    skipped_fast_same_sale_date = 0
+    updated_sale_date_only = 0
+    opened_detail_count = 0
+    opened_in_page = 0
+
+    # As escritas (Supabase + app) vão para uma thread própria: enquanto uma
+    # sai pela rede o browser já está voltando para a lista/abrindo o próximo.
+    writer = ThreadPoolExecutor(max_workers=1)
+    pending_writes = []
+
+    current_page = None
+    try:
+        for page_num in page_nums:
+            current_page = page_num
+            if budget["used"] >= MAX_LOTS:
                 log.warning("MAX_LOTS limit reached (%s). Safe delete will be blocked.", MAX_LOTS)
                 break
 
@@ -1707,24 +1834,25 @@ def run_miami():
                 break
 
             processed_pages += 1
-            log.info("Processing all %s rows from page %s before moving forward", len(rows), page_num)
+            log.info("Processing all %s rows from page %s before moving forward (worker=%s)", len(rows), page_num, worker_id)
 
             for row in rows:
                 caseid = str(row.get("caseid") or "").strip()
                 if caseid:
-                    seen_nodes_this_run.add(caseid)
+                    seen_nodes.add(caseid)
 
             for row in rows:
-                if total_processed_rows >= MAX_LOTS:
+                row_number = claim_row(budget)
+                if row_number is None:
                     break
 
                 caseid = str(row.get("caseid") or "").strip()
                 row_index = row.get("index")
-                total_processed_rows += 1
+                results_url = ""
 
                 log.info(
                     "[row %s/%s] Evaluating caseid=%s page=%s row=%s ...",
-                    total_processed_rows,
+                    row_number,
                     MAX_LOTS,
                     caseid,
                     page_num,
@@ -1732,7 +1860,7 @@ def run_miami():
                 )
 
                 try:
-                    row_parsed = parse_row_text(row.get("row_text", ""))
+                    row_parsed = row["fields"]
 
                     pre_tax_sale_id = clean_text(row_parsed.get("case_number", ""))
                     pre_parcel_number = clean_text(row_parsed.get("parcel_number", ""))
@@ -1742,7 +1870,9 @@ def run_miami():
                     if not existing and pre_tax_sale_id and pre_parcel_number:
                         existing = indexes["by_tax_sale_parcel"].get((pre_tax_sale_id, pre_parcel_number))
 
-                    if existing:
+                    # Sem campos da lista (cabeçalho não reconhecido) não há base
+                    # para pular nem para corrigir sale_date: vai para o detalhe.
+                    if existing and row_parsed:
                         db_sale_date = normalize_sale_date_value(existing.get("sale_date"))
                         same_identity = (
                             clean_text(existing.get("parcel_number") or "") == pre_parcel_number
@@ -1764,19 +1894,14 @@ def run_miami():
                             continue
 
                         if same_identity and not record_needs_enrichment(existing) and db_sale_date != pre_sale_date:
-                            update_result = supabase_update_sale_date(existing.get("id"), pre_sale_date)
-                            supabase_results.append({
-                                "node": caseid,
-                                "mode": "update_sale_date_only",
-                                **update_result,
-                            })
+                            pending_writes.append((
+                                caseid,
+                                page_num,
+                                row_index,
+                                writer.submit(save_sale_date_only, existing, caseid, pre_sale_date),
+                            ))
                             updated_sale_date_only += 1
 
-                            if update_result.get("sent"):
-                                existing["sale_date"] = pre_sale_date
-                                existing["is_active"] = True
-                                existing["removed_at"] = None
-
                             log.info(
                                 "SALE_DATE ONLY UPDATE node=%s old=%s new=%s",
                                 caseid,
@@ -1787,68 +1912,33 @@ def run_miami():
 
                     opened_detail_count += 1
 
+                    if RECYCLE_PAGE_EVERY > 0 and opened_in_page >= RECYCLE_PAGE_EVERY:
+                        page = recycle_page(page, page_num)
+                        opened_in_page = 0
+                    opened_in_page += 1
+
                     if page_num > 1:
                         ok = go_to_page_number(page, page_num)
                         if not ok:
                             raise RuntimeError(f"Could not re-open page {page_num} for caseid={caseid}")
 
-                    base_case = open_case_by_caseid(page, caseid)
+                    results_url = page.url
+                    base_case = open_case_by_caseid(page, row)
                     case_detail = extract_case_detail(page, base_case)
 
-                    record = build_final_record(case_detail)
-                    results.append(record)
-
-                    prop_payload = build_properties_payload(record)
+                    # Montar record/payload e comparar com o existente fica com a
+                    # thread de escrita; o browser já volta para a lista.
+                    pending_writes.append((
+                        caseid,
+                        page_num,
+                        row_index,
+                        writer.submit(finish_case, case_detail, indexes),
+                    ))
 
-                    existing = indexes["by_node"].get(prop_payload.get("node"))
-                    if not existing:
-                        key = (
-                            clean_text(prop_payload.get("tax_sale_id") or ""),
-                            clean_text(prop_payload.get("parcel_number") or ""),
-                        )
-                        if key[0] and key[1]:
-                            existing = indexes["by_tax_sale_parcel"].get(key)
-
-                    if existing and not payload_is_better_than_existing(prop_payload, existing):
-                        is_inactive = existing.get("is_active") is False or clean_text(existing.get("removed_at") or "") != ""
-                        if not is_inactive:
-                            log.info("DETAIL READ but payload not better → skip save node=%s", prop_payload.get("node"))
-                            open_list_and_apply_filter(page)
-                            if page_num > 1:
-                                ok = go_to_page_number(page, page_num)
-                                if not ok:
-                                    raise RuntimeError(f"Could not return to page {page_num} after caseid={caseid}")
-                            continue
-
-                    sb_result = supabase_save_property(prop_payload, existing)
-                    supabase_results.append({
-                        "node": prop_payload.get("node"),
-                        "mode": "full_save",
-                        **sb_result,
-                    })
-
-                    if sb_result.get("sent"):
-                        record_id = sb_result.get("record_id") or (existing.get("id") if existing else None)
-                        idx_record = build_index_record(record_id, prop_payload)
+                    log.info("SUCCESS DETAIL OPEN node=%s", caseid)
 
-                        node_key = clean_text(prop_payload.get("node") or "")
-                        tax_sale_key = clean_text(prop_payload.get("tax_sale_id") or "")
-                        parcel_key = clean_text(prop_payload.get("parcel_number") or "")
-
-                        if node_key:
-                            indexes["by_node"][node_key] = idx_record
-                        if tax_sale_key and parcel_key:
-                            indexes["by_tax_sale_parcel"][(tax_sale_key, parcel_key)] = idx_record
-
-                        send_to_app(prop_payload)
-
-                    log.info("SUCCESS DETAIL OPEN node=%s", prop_payload.get("node"))
-
-                    open_list_and_apply_filter(page)
-                    if page_num > 1:
-                        ok = go_to_page_number(page, page_num)
-                        if not ok:
-                            raise RuntimeError(f"Could not return to page {page_num} after caseid={caseid}")
+                    if not return_to_results(page, results_url, page_num):
+                        raise RuntimeError(f"Could not return to page {page_num} after caseid={caseid}")
 
                 except Exception as e:
                     log.exception("FAILED CASE caseid=%s: %s", caseid, e)
@@ -1860,69 +1950,205 @@ def run_miami():
                     })
 
                     try:
-                        open_list_and_apply_filter(page)
-                        if page_num > 1:
-                            go_to_page_number(page, page_num)
+                        return_to_results(page, results_url, page_num)
                     except Exception:
                         pass
+    except Exception as e:
+        # Falha de navegação/leitura da lista: registrada como falha (bloqueia
+        # o safe delete) em vez de perder as escritas ainda na fila.
+        log.exception("FAILED PAGE page=%s worker=%s: %s", current_page, worker_id, e)
+        failures.append({
+            "caseid": None,
+            "page_num": current_page,
+            "row_index": None,
+            "error": str(e),
+        })
+    finally:
+        # As escritas já enfileiradas sempre drenam, com ou sem exceção.
+        for caseid, write_page, row_index, fut in pending_writes:
+            try:
+                outcome = fut.result()
+                if "record" in outcome:
+                    results.append(outcome["record"])
+                    outcome = outcome["save"]
+                if outcome is not None:
+                    supabase_results.append(outcome)
+            except Exception as e:
+                log.exception("FAILED SAVE caseid=%s: %s", caseid, e)
+                failures.append({
+                    "caseid": caseid,
+                    "page_num": write_page,
+                    "row_index": row_index,
+                    "error": str(e),
+                })
+        writer.shutdown()
 
-        completed_all_pages = (
-            expected_total_pages > 0 and processed_pages == expected_total_pages
-        )
+    return {
+        "results": results,
+        "failures": failures,
+        "supabase_results": supabase_results,
+        "seen_nodes": seen_nodes,
+        "processed_pages": processed_pages,
+        "skipped_fast_same_sale_date": skipped_fast_same_sale_date,
+        "updated_sale_date_only": updated_sale_date_only,
+        "opened_detail_count": opened_detail_count,
+    }
 
-        can_delete_missing = (
-            completed_all_pages
-            and expected_total_items > 0
-            and len(seen_nodes_this_run) == expected_total_items
-            and failures == []
-            and total_processed_rows >= expected_total_items
-        )
 
-        if can_delete_missing:
-            reconcile_result = reconcile_supabase_to_site(seen_nodes_this_run)
-        else:
-            reconcile_result = {
-                "executed": False,
-                "reason": (
-                    f"safe delete blocked: "
-                    f"completed_all_pages={completed_all_pages}, "
-                    f"processed_pages={processed_pages}, "
-                    f"expected_total_pages={expected_total_pages}, "
-                    f"seen_nodes={len(seen_nodes_this_run)}, "
-                    f"expected_total_items={expected_total_items}, "
-                    f"failures_count={len(failures)}, "
-                    f"total_processed_rows={total_processed_rows}, "
-                    f"MAX_LOTS={MAX_LOTS}"
-                ),
-            }
+def process_all_pages(page, total_pages: int, indexes: dict) -> dict:
+    """
+    Distribui as páginas da lista entre DETAIL_WORKERS sessões, que puxam de
+    uma fila compartilhada (ver common.shared_feed) em vez de fatias fixas.
+    O worker 0 usa a página principal (já com a busca aplicada); os demais
+    abrem context próprio na sua thread (e portanto seu próprio Chromium).
+    """
+    budget = {"used": 0, "lock": threading.Lock()}
+    page_nums = list(range(1, total_pages + 1))
+    workers = max(1, min(DETAIL_WORKERS, total_pages))
+
+    if workers == 1:
+        outcome = process_page_batch(page, page_nums, indexes, budget)
+        outcome["rows_evaluated"] = budget["used"]
+        return outcome
+
+    feed = shared_feed(page_nums)
+
+    def run_worker(w):
+        context = None
+        try:
+            context = new_miami_context()
+            worker_page = context.new_page()
+            open_list_and_apply_filter(worker_page)
+            return process_page_batch(worker_page, feed(), indexes, budget, w)
+        finally:
+            if context:
+                try:
+                    context.close()
+                except Exception:
+                    pass
+            close_browsers()
+
+    log.info("Processing %s Miami pages with %s workers", total_pages, workers)
+
+    with ThreadPoolExecutor(max_workers=workers - 1) as ex:
+        futures = [ex.submit(run_worker, w) for w in range(1, workers)]
+        outcomes = [process_page_batch(page, feed(), indexes, budget, 0)]
+        outcomes.extend(f.result() for f in futures)
+
+    merged = {
+        "results": [],
+        "failures": [],
+        "supabase_results": [],
+        "seen_nodes": set(),
+        "processed_pages": 0,
+        "skipped_fast_same_sale_date": 0,
+        "updated_sale_date_only": 0,
+        "opened_detail_count": 0,
+    }
+    for outcome in outcomes:
+        merged["results"].extend(outcome["results"])
+        merged["failures"].extend(outcome["failures"])
+        merged["supabase_results"].extend(outcome["supabase_results"])
+        merged["seen_nodes"].update(outcome["seen_nodes"])
+        for k in ("processed_pages", "skipped_fast_same_sale_date", "updated_sale_date_only", "opened_detail_count"):
+            merged[k] += outcome[k]
+
+    merged["rows_evaluated"] = budget["used"]
+    return merged
+
+
+# =========================
+# MAIN
+# =========================
+def run_miami():
+    log.info("=== MIAMI FINAL OPERATIONAL V8 + STANDARDIZED SAVE FLOW + SAFE DELETE ===")
+
+    supabase_rows = supabase_fetch_all_miami_records() if CAN_CHECK_SUPABASE else []
+    indexes = build_supabase_indexes(supabase_rows)
+
+    context = new_miami_context()
+    page = context.new_page()
+
+    open_list_and_apply_filter(page)
 
-        final_payload = {
-            "source": "MiamiDade",
-            "mode": "final_operational_v8_standardized_save_flow_safe_delete",
-            "expected_total_pages": expected_total_pages,
-            "expected_total_items": expected_total_items,
-            "processed_pages": processed_pages,
-            "seen_nodes_count": len(seen_nodes_this_run),
-            "completed_all_pages": completed_all_pages,
-            "can_delete_missing": can_delete_missing,
-            "rows_evaluated_count": total_processed_rows,
-            "records_count": len(results),
-            "failures_count": len(failures),
-            "fast_skipped_same_sale_date_count": skipped_fast_same_sale_date,
-            "sale_date_only_updates_count": updated_sale_date_only,
-            "detail_opened_count": opened_detail_count,
-            "supabase_results": supabase_results,
-            "reconcile_result": reconcile_result,
-            "page_summary": summary,
-            "records": results,
-            "failures": failures,
+    expected_total_pages = parse_total_pages(page)
+    expected_total_items = parse_total_items(page)
+    summary = get_results_summary(page)
+
+    log.info("Detected total Miami pages: %s", expected_total_pages)
+    log.info("Detected total Miami items: %s", expected_total_items)
+    log.info("Miami detail workers: %s", DETAIL_WORKERS)
+
+    outcome = process_all_pages(page, expected_total_pages, indexes)
+
+    results = outcome["results"]
+    failures = outcome["failures"]
+    supabase_results = outcome["supabase_results"]
+    seen_nodes_this_run = outcome["seen_nodes"]
+    processed_pages = outcome["processed_pages"]
+    total_processed_rows = outcome["rows_evaluated"]
+    skipped_fast_same_sale_date = outcome["skipped_fast_same_sale_date"]
+    updated_sale_date_only = outcome["updated_sale_date_only"]
+    opened_detail_count = outcome["opened_detail_count"]
+
+    completed_all_pages = (
+        expected_total_pages > 0 and processed_pages == expected_total_pages
+    )
+
+    can_delete_missing = (
+        completed_all_pages
+        and expected_total_items > 0
+        and len(seen_nodes_this_run) == expected_total_items
+        and failures == []
+        and total_processed_rows >= expected_total_items
+    )
+
+    if can_delete_missing:
+        reconcile_result = reconcile_supabase_to_site(seen_nodes_this_run)
+    else:
+        reconcile_result = {
+            "executed": False,
+            "reason": (
+                f"safe delete blocked: "
+                f"completed_all_pages={completed_all_pages}, "
+                f"processed_pages={processed_pages}, "
+                f"expected_total_pages={expected_total_pages}, "
+                f"seen_nodes={len(seen_nodes_this_run)}, "
+                f"expected_total_items={expected_total_items}, "
+                f"failures_count={len(failures)}, "
+                f"total_processed_rows={total_processed_rows}, "
+                f"MAX_LOTS={MAX_LOTS}"
+            ),
         }
 
-        log.info("===== FINAL PAYLOAD =====")
-        log.info(json.dumps(final_payload, indent=2))
-        print(json.dumps(final_payload, indent=2))
+    final_payload = {
+        "source": "MiamiDade",
+        "mode": "final_operational_v8_standardized_save_flow_safe_delete",
+        "expected_total_pages": expected_total_pages,
+        "expected_total_items": expected_total_items,
+        "processed_pages": processed_pages,
+        "seen_nodes_count": len(seen_nodes_this_run),
+        "completed_all_pages": completed_all_pages,
+        "can_delete_missing": can_delete_missing,
+        "rows_evaluated_count": total_processed_rows,
+        "records_count": len(results),
+        "failures_count": len(failures),
+        "fast_skipped_same_sale_date_count": skipped_fast_same_sale_date,
+        "sale_date_only_updates_count": updated_sale_date_only,
+        "detail_opened_count": opened_detail_count,
+        "supabase_results": supabase_results,
+        "reconcile_result": reconcile_result,
+        "page_summary": summary,
+        "records": results,
+        "failures": failures,
+    }
+
+    log.info("===== FINAL PAYLOAD =====")
+    final_json = dumps_text(final_payload, indent=True)
+    log.info(final_json)
+    print(final_json)
 
-        browser.close()
+    context.close()
 
 
 if __name__ == "__main__":
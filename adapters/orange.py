@@ -1,18 +1,29 @@
 import os
 import re
-import json
+import html
 import time
 import random
 import logging
-from io import BytesIO
-from datetime import datetime
-from urllib.parse import urljoin, urlparse, parse_qs, quote
-
-import requests
-import pdfplumber
-import pypdfium2
-import pytesseract
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+import subprocess
+import threading
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, quote, unquote_plus
+
+from adapters._browser import LEAN_CHROMIUM_ARGS, STATIC_RESOURCE_TYPES, get_browser, close_browsers, resource_blocker, wait_for_selector_quiet
+from adapters._http import delete_nodes_in_batches, get_session, map_bounded, response_json, send_with_backoff, supabase_headers
+from adapters._pdf_cache import get_cached, put_cached
+from adapters._pdf_pool import PDF_PROCESS_WORKERS, run_in_pdf_process, warm_pdf_pool
+from adapters.common import (
+    WS_RE,
+    clean_text,
+    dumps_text,
+    money_digits,
+    normalize_sale_date_value,
+    now_iso,
+    shared_feed,
+)
 
 
 # =========================
@@ -28,10 +39,32 @@ DEBUG_HTML = os.getenv("DEBUG_HTML", "false").lower() == "true"
 
 RESTART_BROWSER_EVERY = int(os.getenv("RESTART_BROWSER_EVERY", "20"))
 MAX_VIEWER_RETRIES = int(os.getenv("MAX_VIEWER_RETRIES", "3"))
+DETAIL_WORKERS = int(os.getenv("ORANGE_DETAIL_WORKERS", "1"))
+PDF_PIPELINE_DEPTH = int(os.getenv("ORANGE_PDF_PIPELINE_DEPTH", "4"))
+STORAGE_STATE_PATH = (os.getenv("ORANGE_STORAGE_STATE", "orange_state.json") or "").strip()
+STORAGE_STATE_MAX_AGE_S = int(os.getenv("ORANGE_STORAGE_STATE_MAX_AGE_S", str(24 * 3600)))
+SUPABASE_BULK_CHUNK = int(os.getenv("SUPABASE_BULK_CHUNK", "200"))
+SUPABASE_BULK_TIMEOUT = int(os.getenv("SUPABASE_BULK_TIMEOUT", "60"))
 MAX_WAIT = 60_000
 
 OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "3"))
 OCR_SCALE = float(os.getenv("OCR_SCALE", "2.2"))
+# Páginas do mesmo PDF passadas ao tesseract ao mesmo tempo (cada uma é um
+# subprocesso, fora do GIL). 1 volta ao OCR sequencial. O OCR já roda dentro
+# de PDF_PROCESS_WORKERS processos: o default divide os cores entre eles em
+# vez de multiplicar.
+OCR_PAGE_THREADS = int(os.getenv(
+    "OCR_PAGE_THREADS",
+    str(max(1, min(3, (os.cpu_count() or 1) // max(1, PDF_PROCESS_WORKERS)))),
+))
+# Um thread OpenMP por tesseract: o paralelismo já vem dos processos e das
+# páginas; sem isso cada tesseract ainda abre um thread por core.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+# Escala da primeira passada de OCR (só página 1); 0 desliga.
+OCR_FAST_SCALE = float(os.getenv("OCR_FAST_SCALE", "1.5"))
+# Abaixo disso a camada de texto do PDF é tratada como scan e vai para o OCR.
+SCANNED_MIN_CHARS = int(os.getenv("ORANGE_SCANNED_MIN_CHARS", "200"))
+SCANNED_MIN_ALPHA_RATIO = float(os.getenv("ORANGE_SCANNED_MIN_ALPHA_RATIO", "0.3"))
 
 SKIP_IF_ADDRESS_NOT_NUMBERED = os.getenv("SKIP_IF_ADDRESS_NOT_NUMBERED", "true").lower() == "true"
 START_AFTER_LAST_NODE = os.getenv("START_AFTER_LAST_NODE", "false").lower() == "true"
@@ -46,8 +79,6 @@ APP_API_TOKEN = (os.getenv("APP_API_TOKEN", "") or "").strip()
 SEND_TO_APP = bool(APP_API_BASE and APP_API_TOKEN)
 
 TESSERACT_CMD = (os.getenv("TESSERACT_CMD", "") or "").strip()
-if TESSERACT_CMD:
-    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
 
 ORANGE_STATUS_LABELS = [
     "Active Sale",
@@ -59,26 +90,53 @@ log = logging.getLogger("taxdeed-orange-scraper")
 
 
 # =========================
-# HELPERS
+# REGEX
 # =========================
-def now_iso() -> str:
-    return datetime.utcnow().isoformat()
+# Compilados uma vez: o parser de endereço roda sobre o texto inteiro do PDF/OCR.
+NUMBERED_STREET_RE = re.compile(r"^\d{1,6}\s+\S")
+CITY_STATE_ZIP_RE = re.compile(r"([A-Za-z .'-]+)\s*,\s*([A-Z]{2})\s*(\d{5}(?:-\d{4})?)", re.I)
+LEADING_WS_RE = re.compile(r"\s*")
+ADDRESS_MARKERS = [
+    ("ADDRESS_ON_RECORD", re.compile(r"ADDRESS\s+ON\s+RECORD\s+ON\s+CURRENT\s+TAX\s+ROLL\s*[:\-]?", re.I)),
+    ("PHYSICAL_ADDRESS", re.compile(r"PHYSICAL\s+ADDRESS\s*[:\-]?", re.I)),
+    ("TITLE_HOLDER_ADDRESS", re.compile(r"TITLE\s+HOLDER\s+AND\s+ADDRESS\s+OF\s+RECORD\s*[:\-]?", re.I)),
+]
+# Campos da linha do printable (parse_fields_from_row_text) num scan só. Cada
+# alternativa é um lookahead: nada é consumido e cada campo fica com o
+# primeiro match, como numa busca separada por campo.
+ROW_FIELDS_RE = re.compile(
+    r"(?=Tax Sale\s+(?P<tax_sale_id>\d{4}-\d+))"
+    r"|(?=Sale Date:\s*(?P<sale_date>[0-9]{2}/[0-9]{2}/[0-9]{4}))"
+    r"|(?=Status:\s*(?P<status>[A-Za-z ]+?)(?:\s+Parcel:|\s+Min Bid:|\s+High Bid:|$))"
+    r"|(?=Parcel:\s*(?P<parcel>[0-9A-Z\-]+))"
+    r"|(?=Min Bid:\s*\$?\s*(?P<min_bid>[0-9,]+\.\d{2}|[0-9,]+))"
+    r"|(?=Applicant Name:\s*(?P<applicant>.+?)(?:\s+Status:|$))",
+    re.I,
+)
+ROW_FIELDS = len(ROW_FIELDS_RE.groupindex)
+PDF_HREF_RE = re.compile(r'href="([^"]*Property_Information\.pdf[^"]*)"', re.I)
+# node= do link "Tax Sale" direto no href, sem urlparse + parse_qs por link.
+NODE_PARAM_RE = re.compile(r"[?&]node=([^&#]+)")
+# Todos os marcadores numa alternação só: um scan do texto acha a primeira
+# ocorrência de cada um, em vez de uma busca completa por marcador.
+ADDRESS_MARKER_RE = re.compile(
+    "|".join(f"(?P<{name}>{marker_re.pattern})" for name, marker_re in ADDRESS_MARKERS),
+    re.I,
+)
 
 
+# =========================
+# HELPERS
+# =========================
 def norm_ws(s: str) -> str:
-    return re.sub(r"\s+", " ", str(s or "")).strip()
-
-
-def clean_text(value):
-    if value is None:
-        return ""
-    return re.sub(r"\s+", " ", str(value)).strip()
+    return WS_RE.sub(" ", str(s or "")).strip()
 
 
+@lru_cache(maxsize=1024)
 def normalize_money_to_float(value):
     if value in (None, ""):
         return None
-    raw = re.sub(r"[^\d.]", "", str(value))
+    raw = money_digits(value)
     if not raw:
         return None
     try:
@@ -87,13 +145,14 @@ def normalize_money_to_float(value):
         return None
 
 
+@lru_cache(maxsize=1024)
 def normalize_bid_for_payload(v):
     if v is None:
         return None
     s = str(v).strip()
     if not s:
         return None
-    cleaned = re.sub(r"[^0-9.]", "", s.replace(",", ""))
+    cleaned = money_digits(s)
     if not cleaned:
         return None
     try:
@@ -102,15 +161,6 @@ def normalize_bid_for_payload(v):
         return None
 
 
-def normalize_sale_date_value(value: str | None) -> str | None:
-    v = clean_text(value or "")
-    if not v:
-        return None
-    if v.lower() in ("null", "none", "n/a", "na", "not assigned"):
-        return None
-    return v
-
-
 def must_be_pdf(headers: dict) -> bool:
     ct = (headers.get("content-type") or "").lower()
     return "application/pdf" in ct or ct.endswith("/pdf")
@@ -127,21 +177,31 @@ def human_backoff(idx: int, attempt: int):
     time.sleep(sleep_s)
 
 
-def wait_network(page, timeout=20_000):
-    try:
-        page.wait_for_load_state("networkidle", timeout=timeout)
-    except PWTimeout:
-        pass
+# Seletores que indicam que a página já tem o que o próximo passo precisa.
+# Esperar por eles é bem mais rápido que networkidle (que aguarda 500ms sem tráfego).
+SEARCH_READY_SELECTOR = "select[name='DeedStatusID']"
+RESULTS_READY_SELECTOR = "text=Printable Version"
+PRINTABLE_READY_SELECTOR = "a:has-text('Tax Sale')"
+VIEWER_READY_SELECTOR = "a[href*='Property_Information.pdf']"
+
+
+def goto_printable(page, printable_url: str):
+    page.goto(printable_url, wait_until="domcontentloaded", timeout=MAX_WAIT)
+    wait_for_selector_quiet(page, PRINTABLE_READY_SELECTOR, 30_000)
 
 
-def click_any(page, selectors: list[str], label: str) -> bool:
+def click_any(page, selectors: list[str], label: str, timeout=10_000) -> bool:
+    # A ordem da lista é prioridade. Um count() (uma ida e volta rápida)
+    # descarta o seletor ausente sem esperar timeout; o que existe recebe o
+    # click, e se ele falhar passa para o próximo.
     for sel in selectors:
         try:
             loc = page.locator(sel)
-            if loc.count() > 0:
-                loc.first.click()
-                log.info("Clicked: %s (%s)", label, sel)
-                return True
+            if loc.count() == 0:
+                continue
+            loc.first.click(timeout=timeout)
+            log.info("Clicked: %s (%s)", label, sel)
+            return True
         except Exception:
             continue
     return False
@@ -151,7 +211,7 @@ def is_numbered_street_address(addr: str | None) -> bool:
     if not addr:
         return False
     a = addr.strip()
-    return re.match(r"^\d{1,6}\s+\S", a) is not None
+    return NUMBERED_STREET_RE.match(a) is not None
 
 
 # =========================
@@ -161,11 +221,7 @@ def sb_headers(prefer_merge: bool = False):
     if not USE_STATE:
         raise RuntimeError("Supabase not configured")
 
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-    }
+    headers = supabase_headers(SUPABASE_SERVICE_ROLE_KEY)
 
     if prefer_merge:
         headers["Prefer"] = "return=representation,resolution=merge-duplicates"
@@ -176,19 +232,15 @@ def sb_headers(prefer_merge: bool = False):
 
 
 def sb_get(url: str, timeout=30):
-    return requests.get(url, headers=sb_headers(prefer_merge=False), timeout=timeout)
+    return get_session().get(url, headers=sb_headers(prefer_merge=False), timeout=timeout)
 
 
 def sb_post(url: str, payload: dict, timeout=30, prefer_merge=False):
-    return requests.post(url, headers=sb_headers(prefer_merge=prefer_merge), json=payload, timeout=timeout)
+    return get_session().post(url, headers=sb_headers(prefer_merge=prefer_merge), json=payload, timeout=timeout)
 
 
 def sb_patch(url: str, payload: dict, timeout=30):
-    return requests.patch(url, headers=sb_headers(prefer_merge=False), json=payload, timeout=timeout)
-
-
-def sb_delete(url: str, timeout=30):
-    return requests.delete(url, headers=sb_headers(prefer_merge=False), timeout=timeout)
+    return get_session().patch(url, headers=sb_headers(prefer_merge=False), json=payload, timeout=timeout)
 
 
 def get_state_last_node() -> str | None:
@@ -198,14 +250,14 @@ def get_state_last_node() -> str | None:
     url_a = f"{SUPABASE_URL}/rest/v1/scraper_state?scraper_name=eq.{STATE_KEY}&select=last_node"
     r = sb_get(url_a)
     if r.status_code == 200:
-        arr = r.json()
+        arr = response_json(r)
         if arr:
             return arr[0].get("last_node")
 
     url_b = f"{SUPABASE_URL}/rest/v1/scraper_state?id=eq.{STATE_KEY}&select=last_node"
     r2 = sb_get(url_b)
     if r2.status_code == 200:
-        arr = r2.json()
+        arr = response_json(r2)
         if arr:
             return arr[0].get("last_node")
 
@@ -239,15 +291,18 @@ def set_state_last_node(last_node: str | None) -> None:
     raise RuntimeError("Could not update scraper_state")
 
 
-def load_orange_index_from_supabase() -> dict:
+def load_orange_index_from_supabase() -> tuple[dict, set[str]]:
     """
     Carrega tudo do Orange uma vez e monta índice em memória:
     key = (tax_sale_id, parcel_number)
+    Devolve também o set de todos os nodes (inclusive de linhas sem chave),
+    que o reconcile usa no lugar de uma segunda listagem paginada.
     """
     if not USE_STATE:
-        return {}
+        return {}, set()
 
     index = {}
+    nodes = set()
     offset = 0
     page_size = 1000
 
@@ -265,7 +320,7 @@ def load_orange_index_from_supabase() -> dict:
         if r.status_code != 200:
             raise RuntimeError(f"load_orange_index_from_supabase failed: {r.status_code} {r.text[:300]}")
 
-        rows = r.json() or []
+        rows = response_json(r) or []
         if not rows:
             break
 
@@ -277,88 +332,87 @@ def load_orange_index_from_supabase() -> dict:
             if key[0] and key[1]:
                 index[key] = item
 
+            node = clean_text(item.get("node"))
+            if node:
+                nodes.add(node)
+
         if len(rows) < page_size:
             break
 
         offset += page_size
 
     log.info("Loaded Orange index from Supabase: %s records", len(index))
-    return index
+    return index, nodes
 
 
-def update_sale_date_only(record_id: str, sale_date: str | None) -> dict:
-    url = f"{SUPABASE_URL}/rest/v1/properties?id=eq.{quote(str(record_id), safe='')}"
-    payload = {
-        "sale_date": normalize_sale_date_value(sale_date),
-        "updated_at": now_iso(),
-        "is_active": True,
-        "removed_at": None,
-    }
+def bulk_update_sale_dates(updates: list[dict]) -> list[dict]:
+    """
+    Aplica os updates só de sale_date em lote. Os registros são agrupados
+    pelo valor de sale_date e cada chunk vira um único PATCH com id=in.(...),
+    em vez de um PATCH por registro. Os chunks são independentes e vão em
+    paralelo (até SUPABASE_WRITE_CONCURRENCY) pela session compartilhada.
 
-    try:
-        r = sb_patch(url, payload, timeout=20)
-        ok = r.status_code in (200, 204)
-        if ok:
-            log.info("SUPABASE sale_date-only update OK id=%s sale_date=%s", record_id, payload["sale_date"])
-        else:
-            log.warning("SUPABASE sale_date-only update failed id=%s status=%s body=%s", record_id, r.status_code, r.text[:300])
-        return {
-            "sent": ok,
-            "status_code": r.status_code,
-            "response_text": r.text[:500],
-        }
-    except Exception as e:
-        return {
-            "sent": False,
-            "status_code": None,
-            "response_text": str(e),
-        }
+    updates: [{"record_id": ..., "sale_date": ...}, ...]
+    Retorna um resultado por update, na mesma ordem da entrada.
+    """
+    results: list[dict | None] = [None] * len(updates)
 
+    groups: dict[str | None, list[int]] = {}
+    for i, u in enumerate(updates):
+        groups.setdefault(normalize_sale_date_value(u.get("sale_date")), []).append(i)
 
-def payload_quality_score(payload: dict) -> int:
-    fields = [
-        "node",
-        "parcel_number",
-        "sale_date",
-        "address",
-        "city",
-        "state_address",
-        "zip",
-        "pdf_url",
-        "auction_source_url",
-        "opening_bid",
-        "deed_status",
-        "applicant_name",
+    chunk_size = max(1, SUPABASE_BULK_CHUNK)
+    chunks = [
+        (sale_date, positions[start:start + chunk_size])
+        for sale_date, positions in groups.items()
+        for start in range(0, len(positions), chunk_size)
     ]
-    return sum(1 for f in fields if payload.get(f) not in (None, "", [], {}))
-
+    total_chunks = len(chunks)
+
+    def send_chunk(chunk_no: int, sale_date: str | None, chunk: list[int]):
+        ids = ",".join(quote(str(updates[i]["record_id"]), safe="") for i in chunk)
+        url = f"{SUPABASE_URL}/rest/v1/properties?id=in.({ids})"
+        payload = {
+            "sale_date": sale_date,
+            "updated_at": now_iso(),
+            "is_active": True,
+            "removed_at": None,
+        }
 
-def payload_is_better_than_existing(payload: dict, existing: dict) -> bool:
-    new_score = payload_quality_score(payload)
-    old_score = payload_quality_score(existing)
+        try:
+            r = send_with_backoff(lambda: sb_patch(url, payload, timeout=SUPABASE_BULK_TIMEOUT))
+            ok = r.status_code in (200, 204)
+            status_code = r.status_code
+            response_text = r.text[:500]
+        except Exception as e:
+            ok = False
+            status_code = None
+            response_text = str(e)
 
-    if new_score > old_score:
-        return True
+        if ok:
+            log.info(
+                "SUPABASE sale_date-only bulk chunk %d/%d OK rows=%d sale_date=%s",
+                chunk_no, total_chunks, len(chunk), sale_date,
+            )
+        else:
+            log.warning(
+                "SUPABASE sale_date-only bulk chunk %d/%d failed rows=%d status=%s body=%s",
+                chunk_no, total_chunks, len(chunk), status_code, response_text[:300],
+            )
 
-    important_fields = [
-        "address",
-        "city",
-        "state_address",
-        "zip",
-        "pdf_url",
-        "auction_source_url",
-        "opening_bid",
-        "deed_status",
-        "applicant_name",
-    ]
+        for i in chunk:
+            results[i] = {
+                "sent": ok,
+                "status_code": status_code,
+                "response_text": response_text,
+            }
 
-    for f in important_fields:
-        old_val = clean_text(existing.get(f))
-        new_val = clean_text(payload.get(f))
-        if not old_val and new_val:
-            return True
+    map_bounded(
+        lambda item: send_chunk(item[0], *item[1]),
+        enumerate(chunks, start=1),
+    )
 
-    return False
+    return results
 
 
 def insert_property(payload: dict) -> dict:
@@ -368,7 +422,7 @@ def insert_property(payload: dict) -> dict:
         ok = r.status_code in (200, 201)
         body = None
         try:
-            body = r.json()
+            body = response_json(r)
         except Exception:
             body = None
 
@@ -431,11 +485,11 @@ def supabase_save_property(payload: dict, existing: dict | None) -> dict:
     return insert_property(payload)
 
 
-def list_all_orange_nodes_from_supabase() -> list[str]:
+def list_all_orange_nodes_from_supabase() -> set[str]:
     if not USE_STATE:
-        return []
+        return set()
 
-    nodes = []
+    nodes = set()
     offset = 0
     page_size = 1000
 
@@ -452,14 +506,14 @@ def list_all_orange_nodes_from_supabase() -> list[str]:
         if r.status_code != 200:
             raise RuntimeError(f"list_all_orange_nodes_from_supabase failed: {r.status_code} {r.text[:300]}")
 
-        rows = r.json() or []
+        rows = response_json(r) or []
         if not rows:
             break
 
         for item in rows:
             node = clean_text(item.get("node"))
             if node:
-                nodes.append(node)
+                nodes.add(node)
 
         if len(rows) < page_size:
             break
@@ -485,29 +539,7 @@ def delete_nodes_from_supabase(county: str, nodes: list[str]) -> dict:
             "reason": "no nodes to delete",
         }
 
-    deleted_count = 0
-    errors = []
-    batch_size = 100
-
-    for i in range(0, len(nodes), batch_size):
-        batch = nodes[i:i + batch_size]
-        encoded = ",".join(f'"{quote(node, safe="")}"' for node in batch)
-
-        url = (
-            f"{SUPABASE_URL}/rest/v1/properties"
-            f"?county=eq.{quote(county, safe='')}"
-            f"&node=in.({encoded})"
-        )
-
-        try:
-            r = sb_delete(url, timeout=60)
-            if r.status_code in (200, 204):
-                deleted_count += len(batch)
-                log.info("Deleted %s stale nodes from Supabase", len(batch))
-            else:
-                errors.append(f"status={r.status_code} body={r.text[:400]}")
-        except Exception as e:
-            errors.append(str(e))
+    deleted_count, errors = delete_nodes_in_batches(SUPABASE_URL, sb_headers(prefer_merge=False), county, nodes)
 
     return {
         "executed": True,
@@ -517,9 +549,12 @@ def delete_nodes_from_supabase(county: str, nodes: list[str]) -> dict:
     }
 
 
-def reconcile_supabase_to_site(site_nodes_seen: set[str]) -> dict:
+def reconcile_supabase_to_site(site_nodes_seen: set[str], existing_nodes: set[str] | None = None) -> dict:
+    # existing_nodes vem do índice carregado no início do run; linhas gravadas
+    # durante o run são de nodes vistos, então não mudam os candidatos.
     try:
-        existing_nodes = set(list_all_orange_nodes_from_supabase())
+        if existing_nodes is None:
+            existing_nodes = list_all_orange_nodes_from_supabase()
         site_nodes = {clean_text(x) for x in site_nodes_seen if clean_text(x)}
 
         to_delete = sorted(existing_nodes - site_nodes)
@@ -560,31 +595,31 @@ def post_to_app(payload: dict) -> dict | None:
     url = f"{APP_API_BASE}/api/ingest"
     headers = {"Authorization": f"Bearer {APP_API_TOKEN}"}
 
-    last_err = None
-    for attempt in range(1, 4):
-        try:
-            r = requests.post(url, json=payload, headers=headers, timeout=30)
-            log.info("INGEST attempt %d: %s", attempt, r.status_code)
-            snippet = (r.text or "")[:250].replace("\n", " ")
-            log.info("INGEST response snippet: %s", snippet)
-
-            if r.status_code in (200, 201):
-                try:
-                    return r.json()
-                except Exception:
-                    return {"ok": True, "raw": r.text}
+    # Backoff do _http: repete só 5xx/429/erro de conexão, sem dormir depois
+    # da última tentativa; 4xx volta direto.
+    try:
+        r = send_with_backoff(
+            lambda: get_session().post(url, json=payload, headers=headers, timeout=30)
+        )
+    except Exception as e:
+        log.error("INGEST failed after retries: %s", str(e))
+        return None
 
-            if r.status_code == 401:
-                log.error("INGEST unauthorized (401) → check APP_API_TOKEN")
-                return None
+    log.info("INGEST status: %s", r.status_code)
+    snippet = (r.text or "")[:250].replace("\n", " ")
+    log.info("INGEST response snippet: %s", snippet)
 
-            last_err = f"HTTP {r.status_code}: {r.text[:500]}"
-        except Exception as e:
-            last_err = str(e)
+    if r.status_code in (200, 201):
+        try:
+            return response_json(r)
+        except Exception:
+            return {"ok": True, "raw": r.text}
 
-        time.sleep(1.0 * attempt)
+    if r.status_code == 401:
+        log.error("INGEST unauthorized (401) → check APP_API_TOKEN")
+        return None
 
-    log.error("INGEST failed after retries: %s", last_err)
+    log.error("INGEST failed: HTTP %s: %s", r.status_code, r.text[:500])
     return None
 
 
@@ -592,18 +627,18 @@ def post_to_app(payload: dict) -> dict | None:
 # TABLE PARSE
 # =========================
 def parse_fields_from_row_text(row_text: str) -> dict:
-    txt = row_text
-
-    def pick(pattern):
-        m = re.search(pattern, txt, re.I)
-        return m.group(1).strip() if m else ""
+    found = {}
+    for m in ROW_FIELDS_RE.finditer(row_text):
+        found.setdefault(m.lastgroup, m.group(m.lastgroup).strip())
+        if len(found) == ROW_FIELDS:
+            break
 
-    tax_sale_id = pick(r"Tax Sale\s+(\d{4}-\d+)")
-    sale_date = pick(r"Sale Date:\s*([0-9]{2}/[0-9]{2}/[0-9]{4})")
-    status = pick(r"Status:\s*([A-Za-z ]+?)(?:\s+Parcel:|\s+Min Bid:|\s+High Bid:|$)")
-    parcel = pick(r"Parcel:\s*([0-9A-Z\-]+)")
-    min_bid = pick(r"Min Bid:\s*\$?\s*([0-9,]+\.\d{2}|[0-9,]+)")
-    applicant = pick(r"Applicant Name:\s*(.+?)(?:\s+Status:|$)")
+    tax_sale_id = found.get("tax_sale_id", "")
+    sale_date = found.get("sale_date", "")
+    status = found.get("status", "")
+    parcel = found.get("parcel", "")
+    min_bid = found.get("min_bid", "")
+    applicant = found.get("applicant", "")
 
     return {
         "tax_sale_id": clean_text(tax_sale_id),
@@ -615,76 +650,206 @@ def parse_fields_from_row_text(row_text: str) -> dict:
     }
 
 
+# Todos os links do printable e o texto da linha de cada um numa chamada só,
+# em vez de count() + get_attribute() + inner_text() por link. O href já vem
+# resolvido pelo browser (a.href), sem urljoin por linha.
+PRINTABLE_LOTS_JS = """
+els => els.map(a => ({
+    href: a.getAttribute('href') ? a.href : null,
+    row_text: a.closest('tr')?.innerText || '',
+}))
+"""
+
+
 def extract_lots_from_printable(page) -> list[dict]:
     lots = []
-    links = page.locator("a:has-text('Tax Sale')")
-    total = links.count()
-    log.info("Tax Sale links found: %d", total)
-
-    for i in range(total):
-        a = links.nth(i)
-        href = a.get_attribute("href")
-        if not href:
-            continue
+    items = page.locator("a:has-text('Tax Sale')").evaluate_all(PRINTABLE_LOTS_JS)
+    log.info("Tax Sale links found: %d", len(items))
 
-        full = urljoin(page.url, href)
-        q = parse_qs(urlparse(full).query)
-        node = (q.get("node") or [None])[0]
+    for item in items:
+        full = item.get("href")
+        if not full:
+            continue
 
-        try:
-            row_text = a.locator("xpath=ancestor::tr[1]").inner_text(timeout=2000)
-        except Exception:
-            row_text = ""
+        m = NODE_PARAM_RE.search(full)
+        node = clean_text(unquote_plus(m.group(1))) if m else ""
+        # Linha sem node é descartada antes do parse dos campos.
+        if not node:
+            continue
 
-        fields = parse_fields_from_row_text(norm_ws(row_text))
+        row_text = norm_ws(item.get("row_text") or "")
+        fields = parse_fields_from_row_text(row_text)
 
         lots.append({
-            "node": clean_text(node),
+            "node": node,
             "tax_sale_url": full,
-            "row_text": norm_ws(row_text),
+            "row_text": row_text,
             "list_fields": fields,
         })
 
-    return [l for l in lots if l.get("node")]
+    return lots
 
 
 # =========================
 # PDF TEXT + OCR
 # =========================
-def try_pdfplumber_text(pdf_bytes: bytes) -> str:
+def has_primary_address(text: str) -> bool:
+    # ADDRESS ON RECORD é o marcador de maior prioridade em
+    # parse_best_address_from_text: achado com cidade/UF/CEP depois dele,
+    # as páginas seguintes não mudam o endereço escolhido.
+    marker_re = ADDRESS_MARKERS[0][1]
+    mm = marker_re.search(text)
+    return bool(mm and CITY_STATE_ZIP_RE.search(text, mm.end()))
+
+
+# PDFium não é thread-safe e os finishers dos workers rodam em paralelo.
+_pdfium_lock = threading.Lock()
+
+
+# pypdfium2/pytesseract só são importados quando há PDF para ler: um run sem
+# lots novos (ou o processo pai, com o pool de PDF ligado) não paga o import.
+def load_pdfium():
+    import pypdfium2
+    return pypdfium2
+
+
+def load_tesseract():
+    import pytesseract
+    if TESSERACT_CMD:
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+    return pytesseract
+
+
+def pdfium_page_text(pdf, idx: int) -> str:
+    page = pdf[idx]
+    try:
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range().replace("\r\n", "\n").strip()
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+
+
+def try_pdf_text_layer(pdf_bytes: bytes) -> str:
     try:
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            parts = []
-            for p in pdf.pages:
-                t = (p.extract_text() or "").strip()
-                if t:
-                    parts.append(t)
-            return "\n".join(parts).strip()
+        with _pdfium_lock:
+            pdf = load_pdfium().PdfDocument(pdf_bytes)
+            try:
+                parts = []
+                for i in range(len(pdf)):
+                    t = pdfium_page_text(pdf, i)
+                    if t:
+                        parts.append(t)
+                        joined = "\n".join(parts)
+                        if has_primary_address(joined):
+                            log.info("Address marker found on PDF page %d; skipping remaining pages", i + 1)
+                            return joined
+                return "\n".join(parts).strip()
+            finally:
+                pdf.close()
     except Exception:
         return ""
 
 
-def ocr_pdf_bytes(pdf_bytes: bytes, max_pages: int = 3, scale: float = 2.2) -> str:
-    pdf = pypdfium2.PdfDocument(pdf_bytes)
-    n_pages = len(pdf)
-    pages_to_do = min(n_pages, max_pages)
+def ocr_first_page_fast(pdf_bytes: bytes) -> str:
+    with _pdfium_lock:
+        pdf = load_pdfium().PdfDocument(pdf_bytes)
+        try:
+            if len(pdf) == 0:
+                return ""
+            img = render_for_ocr(pdf[0], OCR_FAST_SCALE)
+        finally:
+            pdf.close()
+    return ocr_image(img)
+
 
-    full_text = []
-    for i in range(pages_to_do):
-        page = pdf[i]
-        bitmap = page.render(scale=scale)
-        img = bitmap.to_pil()
-        txt = pytesseract.image_to_string(img, config="--psm 6")
-        if txt:
-            full_text.append(txt)
+def ocr_pdf_bytes(pdf_bytes: bytes, max_pages: int = 3, scale: float = 2.2) -> str:
+    # O bloco ADDRESS ON RECORD fica no topo da página 1: uma passada barata
+    # nela (menos pixels para o tesseract) costuma bastar. Só sem o marcador
+    # completo é que vem o OCR cheio (max_pages na escala normal).
+    if 0 < OCR_FAST_SCALE < scale:
+        txt = ocr_first_page_fast(pdf_bytes).strip()
+        if has_primary_address(txt):
+            log.info("Address marker found by fast OCR (scale=%s) on page 1", OCR_FAST_SCALE)
+            return txt
+
+    with _pdfium_lock:
+        pdf = load_pdfium().PdfDocument(pdf_bytes)
+        try:
+            n_pages = len(pdf)
+            pages_to_do = min(n_pages, max_pages)
+            images = [render_for_ocr(pdf[i], scale) for i in range(pages_to_do)]
+        finally:
+            pdf.close()
+
+    # O render fica sob o lock do PDFium; o OCR das páginas roda em paralelo
+    # e o map devolve os textos na ordem das páginas.
+    workers = max(1, min(OCR_PAGE_THREADS, len(images)))
+    if workers == 1:
+        texts = [ocr_image(img) for img in images]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            texts = list(ex.map(ocr_image, images))
 
-    return "\n".join(full_text).strip()
+    return "\n".join(t for t in texts if t).strip()
 
 
-def _extract_street_before_city(block: str, city_match_start: int) -> str | None:
-    before = block[:city_match_start]
-    lines = [ln.strip() for ln in before.splitlines() if ln.strip()]
-    return lines[-1] if lines else None
+def render_for_ocr(page, scale: float):
+    """
+    Renderiza a página em cinza e devolve um PGM cru (P5) pronto para o
+    stdin do tesseract: um canal em vez de três e nenhuma imagem PIL no
+    meio. Se o PDFium não entregar bitmap de 1 canal, volta ao PIL.
+    """
+    bitmap = page.render(scale=scale, grayscale=True)
+    if bitmap.n_channels != 1:
+        return bitmap.to_pil()
+
+    w, h, stride = bitmap.width, bitmap.height, bitmap.stride
+    buf = memoryview(bitmap.buffer).cast("B")
+    if stride == w:
+        data = bytes(buf[:w * h])
+    else:
+        data = b"".join(buf[r * stride:r * stride + w] for r in range(h))
+    return b"P5\n%d %d\n255\n" % (w, h) + data
+
+
+def ocr_image(img) -> str:
+    if isinstance(img, bytes):
+        # tesseract lê a imagem do stdin e escreve o texto no stdout: sem o
+        # PNG temporário que o pytesseract grava e relê a cada página.
+        out = subprocess.run(
+            [TESSERACT_CMD or "tesseract", "stdin", "stdout", "--psm", "6"],
+            input=img,
+            capture_output=True,
+        )
+        if out.returncode != 0:
+            # Uma página ruim não derruba o PDF inteiro: fica sem texto e o
+            # stderr do tesseract vai para o log.
+            log.warning(
+                "tesseract failed (exit %s): %s",
+                out.returncode,
+                out.stderr.decode("utf-8", errors="replace").strip()[:500],
+            )
+            return ""
+        return out.stdout.decode("utf-8", errors="replace")
+    return load_tesseract().image_to_string(img, config="--psm 6")
+
+
+def _extract_street_before_city(block: str, city_match_start: int, floor: int = 0) -> str | None:
+    # Só a última linha não vazia antes da cidade interessa: varre de trás
+    # para frente em vez de quebrar o bloco inteiro em linhas. floor é o
+    # início da região (logo depois do marcador), sem fatiar o texto.
+    end = city_match_start
+    while end > floor:
+        nl = block.rfind("\n", floor, end)
+        start = floor if nl == -1 else nl + 1
+        line = block[start:end].strip()
+        if line:
+            return line
+        end = start - 1
+    return None
 
 
 def parse_best_address_from_text(text: str) -> dict:
@@ -699,23 +864,25 @@ def parse_best_address_from_text(text: str) -> dict:
             "snippet": ""
         }
 
-    markers = [
-        ("ADDRESS_ON_RECORD", r"ADDRESS\s+ON\s+RECORD\s+ON\s+CURRENT\s+TAX\s+ROLL\s*[:\-]?"),
-        ("PHYSICAL_ADDRESS", r"PHYSICAL\s+ADDRESS\s*[:\-]?"),
-        ("TITLE_HOLDER_ADDRESS", r"TITLE\s+HOLDER\s+AND\s+ADDRESS\s+OF\s+RECORD\s*[:\-]?"),
-    ]
+    marker_ends = {}
+    for mm in ADDRESS_MARKER_RE.finditer(text):
+        marker_ends.setdefault(mm.lastgroup, mm.end())
+        if len(marker_ends) == len(ADDRESS_MARKERS):
+            break
 
-    for marker_name, marker_re in markers:
-        mm = re.search(marker_re, text, re.I)
-        if not mm:
+    for marker_name, _ in ADDRESS_MARKERS:
+        end = marker_ends.get(marker_name)
+        if end is None:
             continue
 
-        after = text[mm.end():].strip()
-        mcity = re.search(r"([A-Za-z .'-]+)\s*,\s*([A-Z]{2})\s*(\d{5}(?:-\d{4})?)", after, re.I)
+        # Busca a partir do marcador no próprio texto, sem copiar o resto
+        # do documento (antes era text[end:].strip() por marcador).
+        start = LEADING_WS_RE.match(text, end).end()
+        mcity = CITY_STATE_ZIP_RE.search(text, start)
         if not mcity:
             continue
 
-        street = _extract_street_before_city(after, mcity.start())
+        street = _extract_street_before_city(text, mcity.start(), start)
         return {
             "address": street,
             "city": mcity.group(1).title().strip(),
@@ -723,10 +890,10 @@ def parse_best_address_from_text(text: str) -> dict:
             "zip": mcity.group(3),
             "marker_used": marker_name,
             "marker_found": True,
-            "snippet": after[:700],
+            "snippet": text[start:start + 700],
         }
 
-    mcity = re.search(r"([A-Za-z .'-]+)\s*,\s*([A-Z]{2})\s*(\d{5}(?:-\d{4})?)", text, re.I)
+    mcity = CITY_STATE_ZIP_RE.search(text)
     if not mcity:
         return {
             "address": None,
@@ -750,6 +917,61 @@ def parse_best_address_from_text(text: str) -> dict:
     }
 
 
+def extract_address_from_pdf(pdf_bytes: bytes) -> dict:
+    cached = get_cached("orange", pdf_bytes)
+    if cached is not None:
+        log.info("PDF unchanged since last parse; using cached address")
+        return cached
+
+    addr = run_in_pdf_process(parse_pdf_address, pdf_bytes)
+    # Só endereço achado vai para o cache; parse/OCR que falhou tenta de novo
+    # no próximo run.
+    if addr.get("address"):
+        put_cached("orange", pdf_bytes, addr)
+    return addr
+
+
+def looks_scanned(text: str) -> bool:
+    # PDF escaneado costuma trazer só um carimbo/cabeçalho na camada de
+    # texto: pouco texto ou quase nada de letras.
+    if len(text) < SCANNED_MIN_CHARS:
+        return True
+    return sum(map(str.isalpha, text)) / len(text) < SCANNED_MIN_ALPHA_RATIO
+
+
+def is_complete_address(addr: dict) -> bool:
+    return bool(addr.get("marker_found") and addr.get("address") and addr.get("city") and addr.get("zip"))
+
+
+def parse_pdf_address(pdf_bytes: bytes) -> dict:
+    text = try_pdf_text_layer(pdf_bytes)
+    text_addr = parse_best_address_from_text(text) if text else None
+
+    # Marcador com rua, cidade e CEP na camada de texto: OCR não tem o que
+    # melhorar, por mais curto que o texto seja.
+    if text_addr and is_complete_address(text_addr):
+        log.info("PDF text length: %d (complete address in text layer)", len(text))
+        return text_addr
+
+    if text and not looks_scanned(text):
+        log.info("PDF text length: %d", len(text))
+        return text_addr
+
+    if text:
+        log.info("PDF text layer looks scanned (%d chars). OCR first %d pages...", len(text), OCR_MAX_PAGES)
+    else:
+        log.info("PDF text layer empty. OCR first %d pages...", OCR_MAX_PAGES)
+    ocr_text = ocr_pdf_bytes(pdf_bytes, max_pages=OCR_MAX_PAGES, scale=OCR_SCALE)
+    log.info("OCR text length: %d", len(ocr_text))
+    addr = parse_best_address_from_text(ocr_text)
+
+    # Com endereço nas duas fontes fica o da camada de texto, que não tem
+    # ruído de OCR; o OCR só vale quando o texto não trouxe endereço.
+    if text_addr and text_addr.get("address"):
+        return text_addr
+    return addr
+
+
 # =========================
 # PAYLOAD / DECISION
 # =========================
@@ -873,25 +1095,21 @@ def set_status_by_visible_text(page, visible_text: str) -> bool:
             log.warning("Dropdown DeedStatusID not found")
             return False
 
-        options = sel.locator("option")
-        count = options.count()
+        # Texto e value de todas as options numa chamada só, em vez de
+        # inner_text() + get_attribute() por option.
+        options = sel.locator("option").evaluate_all(
+            "els => els.map(o => ({text: o.text, value: o.getAttribute('value')}))"
+        )
 
+        wanted = visible_text.lower()
         matched_value = None
-        for i in range(count):
-            opt = options.nth(i)
-            txt = clean_text(opt.inner_text())
-            val = opt.get_attribute("value")
-            if txt.lower() == visible_text.lower():
-                matched_value = val
+        for opt in options:
+            if clean_text(opt.get("text")).lower() == wanted:
+                matched_value = opt.get("value")
                 break
 
         if matched_value is None:
-            available = []
-            for i in range(count):
-                try:
-                    available.append(clean_text(options.nth(i).inner_text()))
-                except Exception:
-                    continue
+            available = [clean_text(opt.get("text")) for opt in options]
             log.warning("Status option not found: %s | available=%s", visible_text, available)
             return False
 
@@ -904,11 +1122,46 @@ def set_status_by_visible_text(page, visible_text: str) -> bool:
         return False
 
 
-def bootstrap_to_printable(p, headless: bool, deed_status_label: str):
-    browser = p.chromium.launch(headless=headless)
-    context = browser.new_context()
-    page = context.new_page()
+# Nada disso é usado pelo fluxo (texto, links e o PDF via context.request).
+BLOCKED_RESOURCE_TYPES = STATIC_RESOURCE_TYPES | {"stylesheet"}
+block_static_assets = resource_blocker(BLOCKED_RESOURCE_TYPES)
+
+
+def new_orange_context(browser, storage_state: str | None = None):
+    context = browser.new_context(
+        storage_state=storage_state,
+        viewport={"width": 800, "height": 600},
+    )
+    context.route("**/*", block_static_assets)
+    return context
+
+
+_storage_state_lock = threading.Lock()
+
+
+def fresh_storage_state() -> str | None:
+    if not STORAGE_STATE_PATH or not os.path.exists(STORAGE_STATE_PATH):
+        return None
+    age = time.time() - os.path.getmtime(STORAGE_STATE_PATH)
+    if age > STORAGE_STATE_MAX_AGE_S:
+        log.info("Saved Orange session is %.0fs old; ignoring", age)
+        return None
+    return STORAGE_STATE_PATH
 
+
+def save_storage_state(context):
+    if not STORAGE_STATE_PATH:
+        return
+    # Vários workers podem terminar o acknowledge ao mesmo tempo.
+    with _storage_state_lock:
+        try:
+            context.storage_state(path=STORAGE_STATE_PATH)
+            log.info("Saved Orange session to %s", STORAGE_STATE_PATH)
+        except Exception as e:
+            log.warning("Could not save Orange session: %s", e)
+
+
+def acknowledge_and_open_search(page):
     log.info("OPEN: %s", LOGIN_URL)
     page.goto(LOGIN_URL, wait_until="domcontentloaded", timeout=MAX_WAIT)
 
@@ -918,12 +1171,52 @@ def bootstrap_to_printable(p, headless: bool, deed_status_label: str):
         "a:has-text('I Acknowledge')",
         "input[value='I Acknowledge']",
     ], "I Acknowledge")
-    wait_network(page)
+    page.wait_for_load_state("domcontentloaded", timeout=MAX_WAIT)
 
     log.info("OPEN SEARCH: %s", SEARCH_URL)
     page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=MAX_WAIT)
-    wait_network(page)
+    wait_for_selector_quiet(page, SEARCH_READY_SELECTOR)
+
+
+def bootstrap_to_printable(headless: bool, deed_status_label: str):
+    browser = get_browser(headless=headless, args=LEAN_CHROMIUM_ARGS)
+
+    # Com a sessão salva (cookies do "I Acknowledge") vamos direto para a busca;
+    # se ela expirou o site devolve o login e refazemos o acknowledge.
+    state_path = fresh_storage_state()
+    context = new_orange_context(browser, state_path)
+    page = context.new_page()
+
+    search_ready = False
+    if state_path:
+        log.info("OPEN SEARCH (saved session): %s", SEARCH_URL)
+        page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=MAX_WAIT)
+        search_ready = wait_for_selector_quiet(page, SEARCH_READY_SELECTOR, 10_000)
+        if search_ready:
+            # Regrava com os cookies renovados: a idade do arquivo passa a
+            # contar do último uso aceito, não do último acknowledge.
+            save_storage_state(context)
+        else:
+            log.info("Saved Orange session not accepted; acknowledging again")
+
+    if not search_ready:
+        acknowledge_and_open_search(page)
+        save_storage_state(context)
+
+    printable_url = search_to_printable(page, deed_status_label)
+    return context, page, printable_url
+
+
+def reopen_search(page):
+    """Volta a aba do context atual para a busca (troca de status group)."""
+    log.info("OPEN SEARCH (same session): %s", SEARCH_URL)
+    page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=MAX_WAIT)
+    if not wait_for_selector_quiet(page, SEARCH_READY_SELECTOR, 10_000):
+        raise RuntimeError("Search page not ready in current session")
+
 
+def search_to_printable(page, deed_status_label: str) -> str:
+    """Da busca já aberta até o printable do status; devolve a URL do printable."""
     if not set_status_by_visible_text(page, deed_status_label):
         if deed_status_label == "Active Sale":
             try:
@@ -943,7 +1236,7 @@ def bootstrap_to_printable(p, headless: bool, deed_status_label: str):
         raise RuntimeError("Could not click Search")
 
     page.wait_for_load_state("domcontentloaded", timeout=MAX_WAIT)
-    wait_network(page, 30_000)
+    wait_for_selector_quiet(page, RESULTS_READY_SELECTOR, 30_000)
 
     ok = click_any(page, [
         "text=Printable Version",
@@ -954,7 +1247,7 @@ def bootstrap_to_printable(p, headless: bool, deed_status_label: str):
         raise RuntimeError("Could not click Printable Version")
 
     page.wait_for_load_state("domcontentloaded", timeout=MAX_WAIT)
-    wait_network(page, 30_000)
+    wait_for_selector_quiet(page, PRINTABLE_READY_SELECTOR, 30_000)
 
     printable_url = page.url
     log.info("After Printable URL (%s): %s", deed_status_label, printable_url)
@@ -962,10 +1255,10 @@ def bootstrap_to_printable(p, headless: bool, deed_status_label: str):
     if DEBUG_HTML:
         log.info("Printable HTML length: %d", len(page.content()))
 
-    return browser, context, page, printable_url
+    return printable_url
 
 
-def safe_close(browser=None, context=None, page=None):
+def safe_close(context=None, page=None):
     try:
         if page:
             page.close()
@@ -976,11 +1269,6 @@ def safe_close(browser=None, context=None, page=None):
             context.close()
     except Exception:
         pass
-    try:
-        if browser:
-            browser.close()
-    except Exception:
-        pass
 
 
 # =========================
@@ -990,365 +1278,581 @@ def open_viewer_with_retry(page, printable_url: str, tax_sale_url: str, idx: int
     viewer_url = ""
     for attempt in range(1, MAX_VIEWER_RETRIES + 1):
         page.goto(tax_sale_url, wait_until="domcontentloaded", timeout=MAX_WAIT)
-        wait_network(page)
         viewer_url = page.url
         log.info("Viewer URL: %s", viewer_url)
 
         if not is_check_human(viewer_url):
-            return viewer_url
+            wait_for_selector_quiet(page, VIEWER_READY_SELECTOR)
+            return page.url
 
         log.warning("Hit checkHuman.jsp (attempt %d/%d).", attempt, MAX_VIEWER_RETRIES)
         human_backoff(idx, attempt)
 
-        page.goto(printable_url, wait_until="domcontentloaded", timeout=MAX_WAIT)
-        wait_network(page, 30_000)
+        goto_printable(page, printable_url)
 
     return viewer_url
 
 
+def fetch_viewer_pdf_href(context, tax_sale_url: str) -> tuple[str, str | None]:
+    """
+    Lê o viewer do lot por HTTP (context.request, com os cookies da sessão)
+    em vez de navegar a aba: sem render nem JS, e a aba continua no printable.
+    Devolve (viewer_url, href do PDF); href None se o link não está no HTML
+    estático ou se caiu no checkHuman — aí o caller usa o browser.
+    """
+    try:
+        resp = context.request.get(tax_sale_url, timeout=MAX_WAIT)
+    except Exception as e:
+        log.info("Viewer HTTP fetch failed (%s); using browser", e)
+        return "", None
+
+    viewer_url = resp.url
+    if not resp.ok or is_check_human(viewer_url):
+        return viewer_url, None
+
+    m = PDF_HREF_RE.search(resp.text() or "")
+    return viewer_url, (html.unescape(m.group(1)) if m else None)
+
+
+def download_lot_pdf(context, pdf_url: str, node: str) -> bytes:
+    log.info("PDF URL: %s", pdf_url)
+
+    pdf_resp = context.request.get(pdf_url, timeout=MAX_WAIT)
+    log.info("PDF HTTP status: %s", pdf_resp.status)
+    log.info("PDF content-type: %s", pdf_resp.headers.get("content-type"))
+
+    if not pdf_resp.ok:
+        preview = (pdf_resp.text() or "")[:600]
+        raise RuntimeError(f"PDF download failed for node={node}: {preview}")
+
+    if not must_be_pdf(pdf_resp.headers):
+        preview = (pdf_resp.text() or "")[:800]
+        raise RuntimeError(f"Response is not PDF for node={node}: {preview}")
+
+    return pdf_resp.body()
+
+
 # =========================
-# MAIN
+# LOT WORKER
 # =========================
-def run():
-    log.info("SEND_TO_APP=%s APP_API_BASE=%s", SEND_TO_APP, APP_API_BASE if APP_API_BASE else "(empty)")
-    log.info("USE_STATE=%s STATE_KEY=%s START_AFTER_LAST_NODE=%s", USE_STATE, STATE_KEY, START_AFTER_LAST_NODE)
-    log.info("MAX_LOTS=%s RESTART_BROWSER_EVERY=%s HEADLESS=%s", MAX_LOTS, RESTART_BROWSER_EVERY, HEADLESS)
-    log.info("OCR_MAX_PAGES=%s OCR_SCALE=%s", OCR_MAX_PAGES, OCR_SCALE)
-    log.info("ORANGE statuses=%s", ORANGE_STATUS_LABELS)
+def finish_lot(job: dict, supabase_index: dict) -> dict:
+    """
+    Parte CPU/HTTP de um lot depois do download do PDF: texto/OCR, payload,
+    Supabase e ingest. Roda no finisher, em paralelo com a navegação do próximo lot.
+    """
+    node = job["node"]
+    key = job["key"]
+    existing = job["existing"]
+    list_fields = job["list_fields"]
+    deed_status_label = job["deed_status_label"]
+    viewer_url = job["viewer_url"]
+    pdf_url = job["pdf_url"]
+    pdf_bytes = job["pdf_bytes"]
+    idx = job["idx"]
+
+    outcome = {"result": None, "supabase_result": None, "failure": None}
 
-    last_node = None
-    if USE_STATE:
-        try:
-            last_node = get_state_last_node()
-            log.info("STATE last_node=%s", last_node)
-        except Exception as e:
-            log.warning("STATE read failed: %s", str(e))
+    try:
+        addr = extract_address_from_pdf(pdf_bytes)
+
+        if SKIP_IF_ADDRESS_NOT_NUMBERED:
+            if not is_numbered_street_address(addr.get("address")):
+                log.warning("Skipping node=%s because address is not numbered: %r", node, addr.get("address"))
+                return outcome
+
+        payload = build_payload_from_detail(
+            node=node,
+            viewer_url=viewer_url,
+            pdf_url=pdf_url,
+            list_fields=list_fields,
+            addr=addr,
+            source_search_status=deed_status_label,
+        )
 
-    supabase_index = {}
-    if USE_STATE:
-        try:
-            supabase_index = load_orange_index_from_supabase()
-        except Exception as e:
-            log.exception("Failed loading Orange index from Supabase: %s", str(e))
-            raise
+        if existing and existing.get("id"):
+            payload["is_active"] = True
+            payload["removed_at"] = None
 
-    with sync_playwright() as p:
-        all_lots = []
-        seen_lot_nodes = set()
-        status_counts = {}
+        print("\n" + "=" * 100)
+        print(f"RESULT LOT {idx}")
+        print("=" * 100)
+        print(dumps_text(payload, indent=True))
 
-        for deed_status_label in ORANGE_STATUS_LABELS:
-            browser = context = page = None
-            printable_url = ""
+        sb_result = supabase_save_property(payload, existing)
+        outcome["supabase_result"] = {
+            "node": node,
+            "mode": "full_save",
+            **sb_result,
+        }
+
+        if sb_result.get("sent"):
+            new_existing = {
+                "id": sb_result.get("record_id") or (existing.get("id") if existing else None),
+                "node": payload.get("node"),
+                "tax_sale_id": payload.get("tax_sale_id"),
+                "parcel_number": payload.get("parcel_number"),
+                "sale_date": payload.get("sale_date"),
+                "pdf_url": payload.get("pdf_url"),
+                "address": payload.get("address"),
+                "city": payload.get("city"),
+                "state_address": payload.get("state_address"),
+                "zip": payload.get("zip"),
+                "opening_bid": payload.get("opening_bid"),
+                "deed_status": payload.get("deed_status"),
+                "applicant_name": payload.get("applicant_name"),
+                "auction_source_url": payload.get("auction_source_url"),
+                "is_active": True,
+                "removed_at": None,
+            }
+            supabase_index[key] = new_existing
 
+        ingest_ok = True
+        ingest_result = None
+        if SEND_TO_APP:
+            ingest_result = post_to_app(payload)
+            ingest_ok = bool(ingest_result)
+
+        if ingest_result:
+            log.info("INGEST OK: %s", ingest_result)
+
+        if ingest_ok:
             try:
-                browser, context, page, printable_url = bootstrap_to_printable(
-                    p,
+                set_state_last_node(node)
+                log.info("STATE updated last_node=%s", node)
+            except Exception as e:
+                log.warning("STATE write failed: %s", str(e))
+
+        outcome["result"] = payload
+    except Exception as e:
+        log.exception("LOT FAILED node=%s error=%s", node, str(e))
+        outcome["failure"] = {
+            "node": node,
+            "status_group": deed_status_label,
+            "error": str(e),
+        }
+
+    return outcome
+
+
+def process_lot_batch(indexed_lots, total: int, supabase_index: dict, worker_id: int = 0) -> dict:
+    """
+    Processa lots (lista ou o feed compartilhado) com sessão própria (context/page).
+    Vários workers podem rodar em paralelo, cada um na sua thread
+    (e portanto com seu próprio browser compartilhado, ver adapters._browser).
+    """
+    results = []
+    failures = []
+    supabase_results = []
+    seen_nodes = set()
+
+    context = page = None
+    printable_url = ""
+    current_status_label = None
+    lots_in_session = 0
+
+    finisher = ThreadPoolExecutor(max_workers=1)
+    pending = deque()
+    sale_date_updates = []
+
+    def collect(fut):
+        outcome = fut.result()
+        if outcome["result"] is not None:
+            results.append(outcome["result"])
+        if outcome["supabase_result"] is not None:
+            supabase_results.append(outcome["supabase_result"])
+        if outcome["failure"] is not None:
+            failures.append(outcome["failure"])
+
+    for idx, lot in indexed_lots:
+        node = clean_text(lot["node"])
+        row_text = lot["row_text"]
+        tax_sale_url = lot["tax_sale_url"]
+        list_fields = lot["list_fields"]
+        deed_status_label = clean_text(lot.get("source_search_status"))
+        stored_printable_url = lot.get("printable_url", "")
+
+        seen_nodes.add(node)
+        lot_failed = False
+
+        log.info("----- LOT %d/%d node=%s status_group=%s worker=%d -----", idx, total, node, deed_status_label, worker_id)
+        log.info("Row text: %s", row_text[:220])
+
+        try:
+            key = (
+                clean_text(list_fields.get("tax_sale_id")),
+                clean_text(list_fields.get("parcel_number")),
+            )
+            existing = supabase_index.get(key)
+
+            action_decision = decide_list_action(list_fields, existing)
+            action = action_decision["action"]
+
+            log.info("DECISION node=%s action=%s reason=%s", node, action, action_decision["reason"])
+
+            if action == "skip":
+                continue
+
+            if action == "update_sale_date_only":
+                if existing and existing.get("id"):
+                    # Acumulado e enviado em lote no fim do batch.
+                    sale_date_updates.append({
+                        "node": node,
+                        "key": key,
+                        "existing": existing,
+                        "record_id": existing["id"],
+                        "sale_date": list_fields.get("sale_date"),
+                    })
+                    continue
+
+            # A sessão do browser só é aberta/trocada para lots que vão à rede:
+            # skips e updates de sale_date resolvem sem Playwright.
+            need_new_session = False
+
+            if context is None or page is None:
+                need_new_session = True
+
+            if RESTART_BROWSER_EVERY > 0 and lots_in_session >= RESTART_BROWSER_EVERY:
+                need_new_session = True
+
+            if not need_new_session and current_status_label != deed_status_label:
+                # Troca de status group não pede context novo: a mesma sessão
+                # (cookies, rotas) refaz a busca. Se falhar, bootstrap completo.
+                try:
+                    reopen_search(page)
+                    printable_url = search_to_printable(page, deed_status_label)
+                    current_status_label = deed_status_label
+                except Exception as e:
+                    log.info("Status switch in current session failed (%s); new session", e)
+                    need_new_session = True
+
+            if need_new_session:
+                safe_close(context, page)
+                context, page, printable_url = bootstrap_to_printable(
                     HEADLESS,
                     deed_status_label,
                 )
+                current_status_label = deed_status_label
+                lots_in_session = 0
+            else:
+                printable_url = stored_printable_url or printable_url
+
+            # Só lots que vão à rede contam para o RESTART_BROWSER_EVERY;
+            # skips e updates de sale_date não envelhecem a sessão.
+            lots_in_session += 1
+
+            # O pdf_url gravado no run anterior já endereça o PDF do lot: tenta
+            # ele direto e só lê o viewer se não servir mais.
+            pdf_bytes = None
+            stored_pdf_url = ""
+            if existing and clean_text(existing.get("node")) == node:
+                stored_pdf_url = clean_text(existing.get("pdf_url"))
 
-                lots = extract_lots_from_printable(page)
-                status_counts[deed_status_label] = len(lots)
-                log.info("Orange status=%s lots found=%s", deed_status_label, len(lots))
+            if stored_pdf_url:
+                try:
+                    pdf_bytes = download_lot_pdf(context, stored_pdf_url, node)
+                    # O viewer não foi aberto: a URL de origem é a do
+                    # registro (o viewer já redirecionado), não o link da lista.
+                    viewer_url = clean_text(existing.get("auction_source_url")) or tax_sale_url
+                    pdf_url = stored_pdf_url
+                except Exception as e:
+                    log.info("Stored pdf_url unusable for node=%s (%s); reading viewer", node, e)
+
+            if pdf_bytes is None:
+                viewer_url, href_pdf = fetch_viewer_pdf_href(context, tax_sale_url)
+                if not href_pdf:
+                    viewer_url = open_viewer_with_retry(page, printable_url, tax_sale_url, idx)
+                    if is_check_human(viewer_url):
+                        raise RuntimeError(f"Blocked by checkHuman.jsp after retries for node={node}")
 
-                for lot in lots:
-                    node = clean_text(lot.get("node"))
-                    if not node or node in seen_lot_nodes:
-                        continue
+                    href_pdf = page.evaluate(
+                        "() => document.querySelector(\"a[href*='Property_Information.pdf']\")?.getAttribute('href') || null"
+                    )
 
-                    seen_lot_nodes.add(node)
-                    lot["source_search_status"] = deed_status_label
-                    lot["printable_url"] = printable_url
-                    all_lots.append(lot)
+                    if not href_pdf:
+                        viewer_html = page.content()
+                        m = PDF_HREF_RE.search(viewer_html)
+                        href_pdf = m.group(1) if m else None
 
-            finally:
-                safe_close(browser, context, page)
+                if not href_pdf:
+                    raise RuntimeError(f"PDF link not found for node={node}")
 
-        if not all_lots:
-            raise RuntimeError("No lots found across Orange statuses")
+                pdf_url = urljoin(viewer_url, href_pdf)
+                pdf_bytes = download_lot_pdf(context, pdf_url, node)
+
+            log.info("PDF bytes: %d", len(pdf_bytes))
+
+            # O parse/OCR do PDF e as escritas no Supabase/app ficam com o
+            # finisher; esta thread já volta ao printable e segue para o próximo lot.
+            pending.append(finisher.submit(finish_lot, {
+                "idx": idx,
+                "node": node,
+                "key": key,
+                "existing": existing,
+                "list_fields": list_fields,
+                "deed_status_label": deed_status_label,
+                "viewer_url": viewer_url,
+                "pdf_url": pdf_url,
+                "pdf_bytes": pdf_bytes,
+            }, supabase_index))
+            while len(pending) > PDF_PIPELINE_DEPTH:
+                collect(pending.popleft())
 
-        total_site_items = len(all_lots)
-        log.info("Total unique lots found in Orange across all statuses: %s", total_site_items)
-        log.info("Status counts: %s", status_counts)
+        except Exception as e:
+            log.exception("LOT FAILED node=%s error=%s", node, str(e))
+            failures.append({
+                "node": node,
+                "status_group": deed_status_label,
+                "error": str(e),
+            })
+            lot_failed = True
 
-        if START_AFTER_LAST_NODE and last_node:
-            pos = next((i for i, l in enumerate(all_lots) if l["node"] == last_node), None)
-            if pos is not None:
-                all_lots = all_lots[pos + 1:]
-                log.info("Continuing AFTER last_node. Remaining lots=%d", len(all_lots))
-            else:
-                log.info("last_node not found in current combined list → processing from top.")
+        try:
+            # Cada lot abre o viewer pela URL, então a aba não precisa voltar
+            # ao printable entre lots; só depois de uma falha, para confirmar
+            # que a sessão ainda responde (senão, reset).
+            if page and printable_url and lot_failed:
+                goto_printable(page, printable_url)
+        except Exception:
+            log.warning("Failed to return printable. Hard reset session.")
+            safe_close(context, page)
+            context = page = None
+            printable_url = ""
+            current_status_label = None
 
-        selected = all_lots[:MAX_LOTS]
-        log.info("Selected lots count=%d", len(selected))
-        log.info("First nodes: %s", [l["node"] for l in selected[:10]])
+        time.sleep(1.0)
 
-        results = []
-        failures = []
-        supabase_results = []
-        seen_nodes_this_run = set()
+    safe_close(context, page)
 
-        completed_all_selected = False
-        can_delete_missing = False
+    while pending:
+        collect(pending.popleft())
+    finisher.shutdown()
 
-        browser = context = page = None
-        printable_url = ""
-        current_status_label = None
+    if sale_date_updates:
+        log.info("SUPABASE sale_date-only bulk: %d records worker=%d", len(sale_date_updates), worker_id)
+        bulk_results = bulk_update_sale_dates(sale_date_updates)
+        for upd, sb_result in zip(sale_date_updates, bulk_results):
+            supabase_results.append({
+                "node": upd["node"],
+                "mode": "sale_date_only",
+                **sb_result,
+            })
 
-        for idx, lot in enumerate(selected, start=1):
-            node = clean_text(lot["node"])
-            row_text = lot["row_text"]
-            tax_sale_url = lot["tax_sale_url"]
-            list_fields = lot["list_fields"]
-            deed_status_label = clean_text(lot.get("source_search_status"))
-            stored_printable_url = lot.get("printable_url", "")
+            if sb_result.get("sent"):
+                existing = upd["existing"]
+                existing["sale_date"] = normalize_sale_date_value(upd["sale_date"])
+                existing["is_active"] = True
+                existing["removed_at"] = None
+                supabase_index[upd["key"]] = existing
 
-            seen_nodes_this_run.add(node)
+    return {
+        "results": results,
+        "failures": failures,
+        "supabase_results": supabase_results,
+        "seen_nodes": seen_nodes,
+    }
 
-            log.info("----- LOT %d/%d node=%s status_group=%s -----", idx, len(selected), node, deed_status_label)
-            log.info("Row text: %s", row_text[:220])
 
-            try:
-                need_new_session = False
+def lot_needs_detail(lot: dict, supabase_index: dict) -> bool:
+    """Mesma decisão do process_lot_batch, sem rede: o lot vai abrir viewer/PDF?"""
+    list_fields = lot["list_fields"]
+    existing = supabase_index.get((
+        clean_text(list_fields.get("tax_sale_id")),
+        clean_text(list_fields.get("parcel_number")),
+    ))
+    action = decide_list_action(list_fields, existing)["action"]
+    if action == "skip":
+        return False
+    if action == "update_sale_date_only" and existing and existing.get("id"):
+        return False
+    return True
 
-                if browser is None or context is None or page is None:
-                    need_new_session = True
 
-                if RESTART_BROWSER_EVERY > 0 and idx > 1 and (idx - 1) % RESTART_BROWSER_EVERY == 0:
-                    need_new_session = True
+def process_selected_lots(selected: list[dict], supabase_index: dict) -> dict:
+    """
+    Distribui os lots entre DETAIL_WORKERS sessões independentes,
+    puxando de uma fila compartilhada (ver common.shared_feed).
+    """
+    indexed = list(enumerate(selected, start=1))
+    total = len(selected)
 
-                if current_status_label != deed_status_label:
-                    need_new_session = True
+    # Skips e updates de sale_date já são conhecidos pelo índice antes de
+    # qualquer browser: num run incremental só os lots novos/incompletos
+    # justificam um worker (e o Chromium dele) a mais.
+    detail_total = sum(1 for lot in selected if lot_needs_detail(lot, supabase_index))
+    log.info("Lots needing detail: %d of %d", detail_total, total)
+    workers = max(1, min(DETAIL_WORKERS, detail_total))
 
-                if need_new_session:
-                    safe_close(browser, context, page)
-                    browser, context, page, printable_url = bootstrap_to_printable(
-                        p,
-                        HEADLESS,
-                        deed_status_label,
-                    )
-                    current_status_label = deed_status_label
-                else:
-                    printable_url = stored_printable_url or printable_url
+    if workers == 1:
+        return process_lot_batch(indexed, total, supabase_index)
 
-                key = (
-                    clean_text(list_fields.get("tax_sale_id")),
-                    clean_text(list_fields.get("parcel_number")),
-                )
-                existing = supabase_index.get(key)
+    # A ordem global (e o agrupamento por status) é mantida pela fila.
+    feed = shared_feed(indexed)
 
-                action_decision = decide_list_action(list_fields, existing)
-                action = action_decision["action"]
+    def run_worker(w):
+        try:
+            return process_lot_batch(feed(), total, supabase_index, w)
+        finally:
+            close_browsers()
 
-                log.info("DECISION node=%s action=%s reason=%s", node, action, action_decision["reason"])
+    log.info("Processing %d lots with %d detail workers", total, workers)
 
-                if action == "skip":
-                    continue
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(run_worker, w) for w in range(workers)]
+        outcomes = [f.result() for f in futures]
 
-                if action == "update_sale_date_only":
-                    if existing and existing.get("id"):
-                        sb_result = update_sale_date_only(existing["id"], list_fields.get("sale_date"))
-                        supabase_results.append({
-                            "node": node,
-                            "mode": "sale_date_only",
-                            **sb_result,
-                        })
-
-                        if sb_result.get("sent"):
-                            existing["sale_date"] = normalize_sale_date_value(list_fields.get("sale_date"))
-                            existing["is_active"] = True
-                            existing["removed_at"] = None
-                            supabase_index[key] = existing
-                        continue
-
-                viewer_url = open_viewer_with_retry(page, printable_url, tax_sale_url, idx)
-                if is_check_human(viewer_url):
-                    raise RuntimeError(f"Blocked by checkHuman.jsp after retries for node={node}")
-
-                pdf_a = page.locator("a[href*='Property_Information.pdf']")
-                href_pdf = pdf_a.first.get_attribute("href") if pdf_a.count() else None
+    merged = {
+        "results": [],
+        "failures": [],
+        "supabase_results": [],
+        "seen_nodes": set(),
+    }
+    for outcome in outcomes:
+        merged["results"].extend(outcome["results"])
+        merged["failures"].extend(outcome["failures"])
+        merged["supabase_results"].extend(outcome["supabase_results"])
+        merged["seen_nodes"].update(outcome["seen_nodes"])
 
-                if not href_pdf:
-                    viewer_html = page.content()
-                    m = re.search(r'href="([^"]*Property_Information\.pdf[^"]*)"', viewer_html, re.I)
-                    href_pdf = m.group(1) if m else None
+    return merged
 
-                if not href_pdf:
-                    raise RuntimeError(f"PDF link not found for node={node}")
 
-                pdf_url = urljoin(viewer_url, href_pdf)
-                log.info("PDF URL: %s", pdf_url)
-
-                pdf_resp = context.request.get(pdf_url, timeout=MAX_WAIT)
-                log.info("PDF HTTP status: %s", pdf_resp.status)
-                log.info("PDF content-type: %s", pdf_resp.headers.get("content-type"))
-
-                if not pdf_resp.ok:
-                    preview = (pdf_resp.text() or "")[:600]
-                    raise RuntimeError(f"PDF download failed for node={node}: {preview}")
-
-                if not must_be_pdf(pdf_resp.headers):
-                    preview = (pdf_resp.text() or "")[:800]
-                    raise RuntimeError(f"Response is not PDF for node={node}: {preview}")
-
-                pdf_bytes = pdf_resp.body()
-                log.info("PDF bytes: %d", len(pdf_bytes))
-
-                text = try_pdfplumber_text(pdf_bytes)
-                if text:
-                    log.info("pdfplumber text length: %d", len(text))
-                    addr = parse_best_address_from_text(text)
-                else:
-                    log.info("pdfplumber empty. OCR first %d pages...", OCR_MAX_PAGES)
-                    ocr_text = ocr_pdf_bytes(pdf_bytes, max_pages=OCR_MAX_PAGES, scale=OCR_SCALE)
-                    log.info("OCR text length: %d", len(ocr_text))
-                    addr = parse_best_address_from_text(ocr_text)
-
-                if SKIP_IF_ADDRESS_NOT_NUMBERED:
-                    if not is_numbered_street_address(addr.get("address")):
-                        log.warning("Skipping node=%s because address is not numbered: %r", node, addr.get("address"))
-                        page.goto(printable_url, wait_until="domcontentloaded", timeout=MAX_WAIT)
-                        wait_network(page, 30_000)
-                        time.sleep(1.0)
-                        continue
-
-                payload = build_payload_from_detail(
-                    node=node,
-                    viewer_url=viewer_url,
-                    pdf_url=pdf_url,
-                    list_fields=list_fields,
-                    addr=addr,
-                    source_search_status=deed_status_label,
-                )
+# =========================
+# MAIN
+# =========================
+def run():
+    log.info("SEND_TO_APP=%s APP_API_BASE=%s", SEND_TO_APP, APP_API_BASE if APP_API_BASE else "(empty)")
+    log.info("USE_STATE=%s STATE_KEY=%s START_AFTER_LAST_NODE=%s", USE_STATE, STATE_KEY, START_AFTER_LAST_NODE)
+    log.info("MAX_LOTS=%s RESTART_BROWSER_EVERY=%s HEADLESS=%s", MAX_LOTS, RESTART_BROWSER_EVERY, HEADLESS)
+    log.info("DETAIL_WORKERS=%s", DETAIL_WORKERS)
+    log.info("OCR_MAX_PAGES=%s OCR_SCALE=%s", OCR_MAX_PAGES, OCR_SCALE)
+    log.info("ORANGE statuses=%s", ORANGE_STATUS_LABELS)
 
-                if existing and existing.get("id"):
-                    payload["is_active"] = True
-                    payload["removed_at"] = None
-
-                print("\n" + "=" * 100)
-                print(f"RESULT LOT {idx}")
-                print("=" * 100)
-                print(json.dumps(payload, indent=2))
-
-                sb_result = supabase_save_property(payload, existing)
-                supabase_results.append({
-                    "node": node,
-                    "mode": "full_save",
-                    **sb_result,
-                })
-
-                if sb_result.get("sent"):
-                    new_existing = {
-                        "id": sb_result.get("record_id") or (existing.get("id") if existing else None),
-                        "node": payload.get("node"),
-                        "tax_sale_id": payload.get("tax_sale_id"),
-                        "parcel_number": payload.get("parcel_number"),
-                        "sale_date": payload.get("sale_date"),
-                        "pdf_url": payload.get("pdf_url"),
-                        "address": payload.get("address"),
-                        "city": payload.get("city"),
-                        "state_address": payload.get("state_address"),
-                        "zip": payload.get("zip"),
-                        "opening_bid": payload.get("opening_bid"),
-                        "deed_status": payload.get("deed_status"),
-                        "applicant_name": payload.get("applicant_name"),
-                        "auction_source_url": payload.get("auction_source_url"),
-                        "is_active": True,
-                        "removed_at": None,
-                    }
-                    supabase_index[key] = new_existing
-
-                ingest_ok = True
-                ingest_result = None
-                if SEND_TO_APP:
-                    ingest_result = post_to_app(payload)
-                    ingest_ok = bool(ingest_result)
-
-                if ingest_result:
-                    log.info("INGEST OK: %s", ingest_result)
-
-                if ingest_ok:
-                    try:
-                        set_state_last_node(node)
-                        log.info("STATE updated last_node=%s", node)
-                    except Exception as e:
-                        log.warning("STATE write failed: %s", str(e))
-
-                results.append(payload)
+    warm_pdf_pool("adapters.orange", "pypdfium2", "pytesseract")
 
-            except Exception as e:
-                log.exception("LOT FAILED node=%s error=%s", node, str(e))
-                failures.append({
-                    "node": node,
-                    "status_group": deed_status_label,
-                    "error": str(e),
-                })
+    last_node = None
+    if USE_STATE:
+        try:
+            last_node = get_state_last_node()
+            log.info("STATE last_node=%s", last_node)
+        except Exception as e:
+            log.warning("STATE read failed: %s", str(e))
 
-            try:
-                if page and printable_url:
-                    page.goto(printable_url, wait_until="domcontentloaded", timeout=MAX_WAIT)
-                    wait_network(page, 30_000)
-            except Exception:
-                log.warning("Failed to return printable. Hard reset session.")
-                safe_close(browser, context, page)
-                browser = context = page = None
-                printable_url = ""
-                current_status_label = None
-
-            time.sleep(1.0)
-
-        completed_all_selected = (
-            len(selected) > 0
-            and len(seen_nodes_this_run) == len(selected)
-            and len(failures) == 0
-        )
+    supabase_index = {}
+    supabase_nodes = None
+    if USE_STATE:
+        try:
+            supabase_index, supabase_nodes = load_orange_index_from_supabase()
+        except Exception as e:
+            log.exception("Failed loading Orange index from Supabase: %s", str(e))
+            raise
 
-        can_delete_missing = (
-            completed_all_selected
-            and len(selected) == total_site_items
-        )
+    all_lots = []
+    seen_lot_nodes = set()
+    status_counts = {}
 
-        if can_delete_missing:
-            reconcile_result = reconcile_supabase_to_site(seen_nodes_this_run)
+    for deed_status_label in ORANGE_STATUS_LABELS:
+        context = page = None
+        printable_url = ""
+
+        try:
+            context, page, printable_url = bootstrap_to_printable(
+                HEADLESS,
+                deed_status_label,
+            )
+
+            lots = extract_lots_from_printable(page)
+            status_counts[deed_status_label] = len(lots)
+            log.info("Orange status=%s lots found=%s", deed_status_label, len(lots))
+
+            for lot in lots:
+                node = clean_text(lot.get("node"))
+                if not node or node in seen_lot_nodes:
+                    continue
+
+                seen_lot_nodes.add(node)
+                lot["source_search_status"] = deed_status_label
+                lot["printable_url"] = printable_url
+                all_lots.append(lot)
+
+        finally:
+            safe_close(context, page)
+
+    if not all_lots:
+        raise RuntimeError("No lots found across Orange statuses")
+
+    total_site_items = len(all_lots)
+    log.info("Total unique lots found in Orange across all statuses: %s", total_site_items)
+    log.info("Status counts: %s", status_counts)
+
+    if START_AFTER_LAST_NODE and last_node:
+        pos = next((i for i, l in enumerate(all_lots) if l["node"] == last_node), None)
+        if pos is not None:
+            all_lots = all_lots[pos + 1:]
+            log.info("Continuing AFTER last_node. Remaining lots=%d", len(all_lots))
         else:
-            reconcile_result = {
-                "executed": False,
-                "reason": (
-                    f"safe delete blocked: "
-                    f"completed_all_selected={completed_all_selected}, "
-                    f"selected_count={len(selected)}, "
-                    f"total_site_items={total_site_items}, "
-                    f"seen_nodes={len(seen_nodes_this_run)}, "
-                    f"failures_count={len(failures)}, "
-                    f"MAX_LOTS={MAX_LOTS}"
-                )
-            }
+            log.info("last_node not found in current combined list → processing from top.")
 
-        final_payload = {
-            "source": "Orange",
-            "mode": "orange_active_sale_plus_lands_available",
-            "status_counts": status_counts,
-            "total_site_items": total_site_items,
-            "selected_count": len(selected),
-            "seen_nodes_count": len(seen_nodes_this_run),
-            "completed_all_selected": completed_all_selected,
-            "can_delete_missing": can_delete_missing,
-            "records_count": len(results),
-            "failures_count": len(failures),
-            "supabase_results": supabase_results,
-            "reconcile_result": reconcile_result,
-            "records": results,
-            "failures": failures,
+    selected = all_lots[:MAX_LOTS]
+    log.info("Selected lots count=%d", len(selected))
+    log.info("First nodes: %s", [l["node"] for l in selected[:10]])
+
+    outcome = process_selected_lots(selected, supabase_index)
+
+    results = outcome["results"]
+    failures = outcome["failures"]
+    supabase_results = outcome["supabase_results"]
+    seen_nodes_this_run = outcome["seen_nodes"]
+
+    completed_all_selected = (
+        len(selected) > 0
+        and len(seen_nodes_this_run) == len(selected)
+        and len(failures) == 0
+    )
+
+    can_delete_missing = (
+        completed_all_selected
+        and len(selected) == total_site_items
+    )
+
+    if can_delete_missing:
+        reconcile_result = reconcile_supabase_to_site(seen_nodes_this_run, supabase_nodes)
+    else:
+        reconcile_result = {
+            "executed": False,
+            "reason": (
+                f"safe delete blocked: "
+                f"completed_all_selected={completed_all_selected}, "
+                f"selected_count={len(selected)}, "
+                f"total_site_items={total_site_items}, "
+                f"seen_nodes={len(seen_nodes_this_run)}, "
+                f"failures_count={len(failures)}, "
+                f"MAX_LOTS={MAX_LOTS}"
+            )
         }
 
-        log.info("===== FINAL PAYLOAD =====")
-        log.info(json.dumps(final_payload, indent=2))
-        print(json.dumps(final_payload, indent=2))
+    final_payload = {
+        "source": "Orange",
+        "mode": "orange_active_sale_plus_lands_available",
+        "status_counts": status_counts,
+        "total_site_items": total_site_items,
+        "selected_count": len(selected),
+        "seen_nodes_count": len(seen_nodes_this_run),
+        "completed_all_selected": completed_all_selected,
+        "can_delete_missing": can_delete_missing,
+        "records_count": len(results),
+        "failures_count": len(failures),
+        "supabase_results": supabase_results,
+        "reconcile_result": reconcile_result,
+        "records": results,
+        "failures": failures,
+    }
+
+    log.info("===== FINAL PAYLOAD =====")
+    final_json = dumps_text(final_payload, indent=True)
+    log.info(final_json)
+    print(final_json)
 
-        log.info("DONE.")
-        safe_close(browser, context, page)
+    log.info("DONE.")
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
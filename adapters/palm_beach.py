@@ -1,20 +1,31 @@
 import os
 import re
-import json
 import time
 import random
 import logging
-from io import BytesIO
 from datetime import date, timedelta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, quote
 
 import requests
-import pdfplumber
-import pypdfium2
-import pytesseract
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from requests.adapters import HTTPAdapter
+import lxml.html
+from playwright.sync_api import TimeoutError as PWTimeout
+
+from adapters._browser import LEAN_CHROMIUM_ARGS, get_browser, resource_blocker, wait_for_selector_quiet
+from adapters._http import delete_nodes_in_batches, get_session, response_json, supabase_headers
+from adapters._pdf_cache import get_cached, get_cached_url, put_cached, put_cached_url
+from adapters._pdf_pool import run_in_pdf_process, warm_pdf_pool
+from adapters.common import (
+    DEFAULT_IMPORTANT_FIELDS,
+    WS_RE,
+    dumps_text,
+    money_digits,
+    normalize_sale_date_value,
+    payload_is_better_than_existing as common_payload_is_better,
+)
 
 log = logging.getLogger("taxdeed-palmbeach")
 
@@ -40,6 +51,75 @@ PALM_BEACH_MAX_CASES = int(os.getenv("PALM_BEACH_MAX_CASES", "500"))
 PALM_BEACH_FROM_DATE = (os.getenv("PALM_BEACH_FROM_DATE", "") or "").strip()
 PALM_BEACH_TO_DATE = (os.getenv("PALM_BEACH_TO_DATE", "") or "").strip()
 SAFE_DELETE_ENABLED = os.getenv("PALM_BEACH_SAFE_DELETE_ENABLED", "true").lower() == "true"
+FETCH_WORKERS = int(os.getenv("PALM_BEACH_FETCH_WORKERS", "4"))
+APPRAISER_CACHE_TTL_S = int(os.getenv("PALM_BEACH_APPRAISER_CACHE_TTL_S", str(7 * 24 * 3600)))
+
+
+# =========================
+# REGEX
+# =========================
+# Compilados uma vez: rodam por linha/página de PDF e por endereço validado.
+NUMBERED_STREET_RE = re.compile(r"^\d{1,6}\s+[A-Z0-9 .'\-#/]+$", re.I)
+STREET_CHARS_RE = re.compile(r"^[0-9A-Z .'\-#/]+$", re.I)
+CITY_FL_ZIP_RE = re.compile(r"([A-Z][A-Z .'-]+)\s+FL\s+(\d{5})(?:-\d{4}|\s+\d{4})?", re.I)
+# Âncoras do texto do PDF (Location Address, Municipality, Mailing Address)
+# num scan só, no mesmo esquema de lookaheads do ROW_SUMMARY_RE: cada âncora
+# fica com o primeiro match, como numa busca separada por âncora.
+PDF_ADDRESS_ANCHOR_RE = re.compile(
+    r"(?=Location Address\s*:\s*(?P<location>.+))"
+    r"|(?=Municipality\s*:\s*(?P<municipality>[A-Z][A-Z .'-]+))"
+    r"|(?=(?s:Mailing Address\s*\n+\s*(?P<mailing_street>.+?)\s*\n+\s*(?P<mailing_city>[A-Z][A-Z ]+)"
+    r"\s+FL\s+(?P<mailing>\d{5})(?:-\d{4}|\s+\d{4})?))",
+    re.I,
+)
+PDF_ADDRESS_ANCHORS = ("location", "municipality", "mailing")  # lastgroup de cada âncora
+CITY_LINE_RE = re.compile(r"^([A-Z][A-Z .'-]+)\s+FL\s+(\d{5})(?:-\d{4})?$", re.I)
+ZIP5_RE = re.compile(r"(\d{5})")
+YOU_ENTERED_RE = re.compile(r"you[^\S\n]+entered", re.I)
+
+# Texto da linha de resultado (parse_summary_from_row_text): todos os campos
+# num scan só. Cada alternativa é um lookahead, então nada é consumido e cada
+# campo fica com o primeiro match, como numa busca separada por campo.
+ROW_SUMMARY_RE = re.compile(
+    r"(?=(?:Case Number|Case)\s*[:#]?\s*(?P<case_number>[A-Z0-9\-\/]+))"
+    r"|(?=(?:Parcel ID|Parcel|PCN)\s*[:#]?\s*(?P<parcel_number>[A-Z0-9\-]+))"
+    r"|(?=(?:Auction Date|Sale Date|Date)\s*[:#]?\s*(?P<sale_date>[0-9]{1,2}/[0-9]{1,2}/[0-9]{4}))"
+    r"|(?=Status\s*[:#]?\s*(?P<status>[A-Z ]+))"
+    r"|(?=(?:Opening Bid|Min Bid|Minimum Bid)\s*[:#]?\s*\$?\s*(?P<opening_bid>[0-9,]+\.\d{2}|[0-9,]+))",
+    re.I,
+)
+ROW_SUMMARY_FIELDS = len(ROW_SUMMARY_RE.groupindex)
+
+# Página de detalhe do case: "Label\n valor". Um único scan com todos os
+# labels; o label casado é resolvido para o campo por lookup no dict.
+CASE_DETAIL_LABELS = {
+    "case number": "case_number",
+    "parcel id": "parcel_number",
+    "auction date": "sale_date",
+    "status": "status",
+    "opening bid": "opening_bid",
+    "applicant names": "applicant",
+}
+# O valor fica num lookahead: o scan só consome o label, então um campo em
+# branco (cujo "valor" é o label seguinte) não esconde esse próximo label.
+CASE_DETAIL_RE = re.compile(
+    r"(Case Number|Parcel ID|Auction Date|Status|Opening Bid|Applicant Names)(?=\s*\n\s*(.+))",
+    re.I,
+)
+# Marcadores de uma página de case válida; buscados case-insensitive direto
+# no HTML, sem o html.lower() que copiava a página inteira.
+VALID_CASE_MARKERS_RE = tuple(
+    re.compile(re.escape(marker), re.I)
+    for marker in ("case number", "parcel id", "auction date")
+)
+
+
+# Labels da página do Property Appraiser; o valor vem na linha seguinte.
+APPRAISER_LABELS = {
+    "LOCATION ADDRESS": "address",
+    "MUNICIPALITY": "municipality",
+    "ZIP": "zip",
+}
 
 
 # =========================
@@ -51,33 +131,29 @@ def textify(value) -> str:
     return str(value)
 
 
-def norm(value) -> str:
-    return re.sub(r"\s+", " ", textify(value)).strip()
+def html_text(html) -> str:
+    """
+    Texto de um HTML via lxml, um nó de texto por linha (sem script/style).
+    Bem mais barato que inner_text(), que obriga o Chromium a calcular o
+    texto renderizado (layout, white-space, display) da página inteira.
+    Aceita o HTML ou a árvore já parseada, para quem ainda usa o root.
+    """
+    root = lxml.html.fromstring(html) if isinstance(html, (str, bytes)) else html
+    return "\n".join(root.xpath("//text()[not(ancestor::script) and not(ancestor::style)]"))
 
 
-def clean_text(value):
-    if value is None:
-        return ""
-    return re.sub(r"\s+", " ", str(value)).strip()
+def norm(value) -> str:
+    return WS_RE.sub(" ", textify(value)).strip()
 
 
+@lru_cache(maxsize=1024)
 def clean_bid(v):
     if v is None:
         return None
-    cleaned = re.sub(r"[^\d.]", "", str(v))
+    cleaned = money_digits(v)
     return cleaned or None
 
 
-def normalize_sale_date_value(value: Optional[str]) -> Optional[str]:
-    v = norm(value or "")
-    if not v:
-        return None
-    low = v.lower()
-    if low in ("null", "none", "n/a", "na", "not assigned"):
-        return None
-    return v
-
-
 def empty_addr():
     return {
         "address": None,
@@ -144,10 +220,10 @@ def is_valid_property_address(addr: str) -> bool:
     if looks_like_garbage_address(a):
         return False
 
-    if re.match(r"^\d{1,6}\s+[A-Z0-9 .'\-#/]+$", a, re.I):
+    if NUMBERED_STREET_RE.match(a):
         return True
 
-    if re.match(r"^[0-9A-Z .'\-#/]+$", a, re.I) and len(a.split()) <= 8:
+    if STREET_CHARS_RE.match(a) and len(a.split()) <= 8:
         return True
 
     return False
@@ -170,52 +246,32 @@ def sanitize_address_payload(addr: dict) -> dict:
     }
 
 
-def payload_quality_score(payload: dict) -> int:
-    fields = [
-        "node",
-        "tax_sale_id",
-        "parcel_number",
-        "sale_date",
-        "opening_bid",
-        "deed_status",
-        "applicant_name",
-        "pdf_url",
-        "auction_source_url",
-        "address",
-        "city",
-        "state_address",
-        "zip",
-    ]
-    return sum(1 for f in fields if payload.get(f) not in (None, "", []))
-
-
-def payload_is_better_than_existing(payload: dict, existing: dict) -> bool:
-    new_score = payload_quality_score(payload)
-    old_score = payload_quality_score(existing)
-
-    if new_score > old_score:
-        return True
+PALM_BEACH_SCORE_FIELDS = (
+    "node",
+    "tax_sale_id",
+    "parcel_number",
+    "sale_date",
+    "opening_bid",
+    "deed_status",
+    "applicant_name",
+    "pdf_url",
+    "auction_source_url",
+    "address",
+    "city",
+    "state_address",
+    "zip",
+)
 
-    important_fields = [
-        "address",
-        "city",
-        "state_address",
-        "zip",
-        "pdf_url",
-        "auction_source_url",
-        "opening_bid",
-        "deed_status",
-        "applicant_name",
-        "address_source_marker",
-    ]
+PALM_BEACH_IMPORTANT_FIELDS = DEFAULT_IMPORTANT_FIELDS + ("address_source_marker",)
 
-    for f in important_fields:
-        old_val = norm(existing.get(f))
-        new_val = norm(payload.get(f))
-        if not old_val and new_val:
-            return True
 
-    return False
+def payload_is_better_than_existing(payload: dict, existing: dict) -> bool:
+    return common_payload_is_better(
+        payload,
+        existing,
+        score_fields=PALM_BEACH_SCORE_FIELDS,
+        important_fields=PALM_BEACH_IMPORTANT_FIELDS,
+    )
 
 
 def existing_record_needs_enrichment(existing: dict) -> bool:
@@ -237,11 +293,37 @@ def human_pause(a=0.20, b=0.60):
     time.sleep(random.uniform(a, b))
 
 
-def wait_network_quiet(page, timeout=10000):
+# Espera pelo elemento que o próximo passo usa em vez de networkidle
+# (que aguarda 500ms sem tráfego e nunca chega em páginas com polling).
+STATUS_FORM_SELECTOR = "#dateFromStatus, [name='dateFromStatus']"
+
+FIRST_RESULT_ROW_ID_JS = """
+() => {
+    const row = Array.from(document.querySelectorAll("tr[role='row'][id]"))
+        .find(r => /^\\d+$/.test(r.id));
+    return row ? row.id : "";
+}
+"""
+
+
+def first_result_row_id(page) -> str:
+    try:
+        return page.evaluate(FIRST_RESULT_ROW_ID_JS) or ""
+    except Exception:
+        return ""
+
+
+def wait_for_results(page, previous_first_id: str = "", timeout=15000) -> bool:
+    """Espera o grid ter uma linha de case e, se informado, ela ser outra."""
     try:
-        page.wait_for_load_state("networkidle", timeout=timeout)
+        page.wait_for_function(
+            f"(prev) => {{ const id = ({FIRST_RESULT_ROW_ID_JS})(); return id && id !== prev; }}",
+            arg=previous_first_id,
+            timeout=timeout,
+        )
+        return True
     except PWTimeout:
-        pass
+        return False
 
 
 def visible_elements(locator):
@@ -299,7 +381,7 @@ def send(payload):
         return True
 
     try:
-        r = requests.post(
+        r = get_session().post(
             f"{APP_API_BASE}/api/ingest",
             json=payload,
             headers={"Authorization": f"Bearer {APP_API_TOKEN}"},
@@ -318,11 +400,7 @@ def send(payload):
 # SUPABASE
 # =========================
 def sb_headers():
-    return {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-    }
+    return supabase_headers(SUPABASE_SERVICE_ROLE_KEY)
 
 
 def supabase_fetch_all_palm_beach_records() -> List[dict]:
@@ -343,7 +421,7 @@ def supabase_fetch_all_palm_beach_records() -> List[dict]:
         )
 
         try:
-            r = requests.get(url, headers=sb_headers(), timeout=60)
+            r = get_session().get(url, headers=sb_headers(), timeout=60)
             if r.status_code != 200:
                 log.warning(
                     "supabase_fetch_all_palm_beach_records failed status=%s body=%s",
@@ -352,7 +430,7 @@ def supabase_fetch_all_palm_beach_records() -> List[dict]:
                 )
                 break
 
-            arr = r.json() or []
+            arr = response_json(r) or []
             if not arr:
                 break
 
@@ -418,7 +496,7 @@ def supabase_update_sale_date(record_id: str, sale_date: Optional[str]) -> dict:
     payload = {"sale_date": normalize_sale_date_value(sale_date)}
 
     try:
-        r = requests.patch(url, headers=headers, json=payload, timeout=30)
+        r = get_session().patch(url, headers=headers, json=payload, timeout=30)
         ok = r.status_code in (200, 204)
         if ok:
             log.info("SUPABASE SALE_DATE UPDATE OK id=%s sale_date=%s", record_id, payload["sale_date"])
@@ -458,7 +536,7 @@ def supabase_insert_or_update_property(payload: dict) -> dict:
     headers["Prefer"] = "return=representation,resolution=merge-duplicates"
 
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=30)
+        r = get_session().post(url, headers=headers, json=payload, timeout=30)
         ok = r.status_code in (200, 201)
 
         if ok:
@@ -507,34 +585,7 @@ def supabase_delete_nodes(nodes: List[str]) -> dict:
             "reason": "no nodes to delete",
         }
 
-    deleted_count = 0
-    errors = []
-    batch_size = 100
-
-    for i in range(0, len(nodes), batch_size):
-        batch = nodes[i:i + batch_size]
-
-        try:
-            quoted = ",".join(f'"{quote(node, safe="")}"' for node in batch)
-            url = (
-                f"{SUPABASE_URL}/rest/v1/properties"
-                f"?county=eq.PalmBeach"
-                f"&node=in.({quoted})"
-            )
-
-            r = requests.delete(url, headers=sb_headers(), timeout=60)
-            if r.status_code in (200, 204):
-                deleted_count += len(batch)
-                log.info("SUPABASE DELETE batch ok count=%s", len(batch))
-            else:
-                msg = f"status={r.status_code} body={r.text[:500]}"
-                errors.append(msg)
-                log.warning("SUPABASE DELETE batch failed: %s", msg)
-
-        except Exception as e:
-            msg = str(e)
-            errors.append(msg)
-            log.warning("SUPABASE DELETE batch exception: %s", msg)
+    deleted_count, errors = delete_nodes_in_batches(SUPABASE_URL, sb_headers(), "PalmBeach", nodes)
 
     return {
         "executed": True,
@@ -607,23 +658,30 @@ def build_adaptive_page_order(total_pages: int) -> List[int]:
     return order
 
 
-def read_single_pdf_page(pdf_bytes: bytes, page_num: int) -> str:
+def read_single_pdf_page(doc, page_num: int) -> str:
     try:
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            idx = page_num - 1
-            if 0 <= idx < len(pdf.pages):
-                return (pdf.pages[idx].extract_text() or "").strip()
+        idx = page_num - 1
+        if 0 <= idx < len(doc):
+            page = doc[idx]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    return textpage.get_text_range().replace("\r\n", "\n").strip()
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
     except Exception:
         pass
     return ""
 
 
-def ocr_single_pdf_page(pdf_bytes: bytes, page_num: int) -> str:
+def ocr_single_pdf_page(doc, page_num: int) -> str:
     try:
-        doc = pypdfium2.PdfDocument(pdf_bytes)
         idx = page_num - 1
         if 0 <= idx < len(doc):
             img = doc[idx].render(scale=OCR_SCALE).to_pil()
+            import pytesseract
             return pytesseract.image_to_string(img, config="--psm 6").strip()
     except Exception:
         pass
@@ -636,19 +694,21 @@ def parse_location_or_mailing_address(text: str) -> dict:
 
     t = text.replace("\r", "\n")
 
-    m_loc = re.search(r"Location Address\s*:\s*(.+)", t, re.I)
+    anchors = {}
+    for m in PDF_ADDRESS_ANCHOR_RE.finditer(t):
+        anchors.setdefault(m.lastgroup, m)
+        if len(anchors) == len(PDF_ADDRESS_ANCHORS):
+            break
+
+    m_loc = anchors.get("location")
     if m_loc:
-        street = normalize_property_address(m_loc.group(1))
+        street = normalize_property_address(m_loc.group("location"))
 
         if is_valid_property_address(street):
-            m_muni = re.search(r"Municipality\s*:\s*([A-Z][A-Z .'-]+)", t, re.I)
-            municipality = norm(m_muni.group(1)).title() if m_muni else None
+            m_muni = anchors.get("municipality")
+            municipality = norm(m_muni.group("municipality")).title() if m_muni else None
 
-            m_city_zip = re.search(
-                r"([A-Z][A-Z .'-]+)\s+FL\s+(\d{5})(?:-\d{4}|\s+\d{4})?",
-                t,
-                re.I
-            )
+            m_city_zip = CITY_FL_ZIP_RE.search(t)
 
             if m_city_zip:
                 return {
@@ -667,15 +727,11 @@ def parse_location_or_mailing_address(text: str) -> dict:
                 "source": "PDF_LOCATION_ADDRESS",
             }
 
-    m_mail = re.search(
-        r"Mailing Address\s*\n+\s*(.+?)\s*\n+\s*([A-Z][A-Z ]+)\s+FL\s+(\d{5})(?:-\d{4}|\s+\d{4})?",
-        t,
-        re.I | re.S,
-    )
+    m_mail = anchors.get("mailing")
     if m_mail:
-        street = normalize_property_address(m_mail.group(1))
-        city = norm(m_mail.group(2)).title()
-        zip_code = m_mail.group(3)
+        street = normalize_property_address(m_mail.group("mailing_street"))
+        city = norm(m_mail.group("mailing_city")).title()
+        zip_code = m_mail.group("mailing")
 
         if is_valid_property_address(street):
             return {
@@ -689,42 +745,58 @@ def parse_location_or_mailing_address(text: str) -> dict:
     return empty_addr()
 
 
+def next_nonempty_lines(text: str, pos: int, limit: int) -> List[str]:
+    lines = []
+    while len(lines) < limit and pos <= len(text):
+        end = text.find("\n", pos)
+        if end == -1:
+            end = len(text)
+        line = norm(text[pos:end])
+        if line:
+            lines.append(line)
+        pos = end + 1
+    return lines
+
+
 def parse_you_entered_address(text: str) -> dict:
     if not text:
         return empty_addr()
 
-    lines = [norm(x) for x in text.replace("\r", "\n").splitlines() if norm(x)]
+    t = text.replace("\r", "\n")
 
-    for i, line in enumerate(lines):
-        if "you entered" in line.lower():
-            window = lines[i:i + 12]
+    # Em vez de quebrar a página inteira em linhas, o regex acha cada
+    # "You entered" e só as 12 linhas a partir dali são normalizadas.
+    last_line_start = -1
+    for m in YOU_ENTERED_RE.finditer(t):
+        line_start = t.rfind("\n", 0, m.start()) + 1
+        if line_start == last_line_start:
+            continue
+        last_line_start = line_start
 
-            for j in range(len(window) - 2, -1, -1):
-                addr_line = window[j]
-                if j + 1 >= len(window):
-                    continue
+        window = next_nonempty_lines(t, line_start, 12)
 
-                city_line = window[j + 1]
+        for j in range(len(window) - 2, -1, -1):
+            addr_line = window[j]
+            if j + 1 >= len(window):
+                continue
 
-                m_city = re.search(
-                    r"^([A-Z][A-Z .'-]+)\s+FL\s+(\d{5})(?:-\d{4})?$",
-                    city_line,
-                    re.I
-                )
-                if not m_city:
-                    continue
+            city_line = window[j + 1]
 
-                addr_line = normalize_property_address(addr_line)
-                if not is_valid_property_address(addr_line):
-                    continue
+            m_city = CITY_LINE_RE.search(city_line)
+            if not m_city:
+                continue
 
-                return {
-                    "address": addr_line,
-                    "city": norm(m_city.group(1)).title(),
-                    "state": "FL",
-                    "zip": m_city.group(2),
-                    "source": "PDF_USPS_YOU_ENTERED",
-                }
+            addr_line = normalize_property_address(addr_line)
+            if not is_valid_property_address(addr_line):
+                continue
+
+            return {
+                "address": addr_line,
+                "city": norm(m_city.group(1)).title(),
+                "state": "FL",
+                "zip": m_city.group(2),
+                "source": "PDF_USPS_YOU_ENTERED",
+            }
 
     return empty_addr()
 
@@ -747,33 +819,54 @@ def parse_address_from_pdf_text(text: str) -> dict:
 
 
 def extract_pdf_addr(pdf_bytes: bytes) -> dict:
+    cached = get_cached("palm_beach", pdf_bytes)
+    if cached is not None:
+        log.info("PDF unchanged since last parse; using cached address")
+        return cached
+
+    addr = run_in_pdf_process(extract_pdf_addr_uncached, pdf_bytes)
+    # Só endereço achado vai para o cache; parse/OCR que falhou tenta de novo
+    # no próximo run.
+    if addr.get("address"):
+        put_cached("palm_beach", pdf_bytes, addr)
+    return addr
+
+
+def extract_pdf_addr_uncached(pdf_bytes: bytes) -> dict:
+    # O PDF é aberto uma vez (PDFium serve texto e OCR) e lido página a página
+    # na ordem adaptativa; a primeira página com endereço válido encerra a busca.
+    # Import só aqui: sem PDF para ler, o run não carrega PDFium/tesseract.
+    import pypdfium2
     try:
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            total_pages = len(pdf.pages)
+        doc = pypdfium2.PdfDocument(pdf_bytes)
     except Exception:
-        total_pages = 0
-
-    if total_pages <= 0:
         return empty_addr()
 
-    page_order = build_adaptive_page_order(total_pages)
-    log.info("Adaptive PDF page order: %s", page_order)
-
-    for p in page_order:
-        txt = read_single_pdf_page(pdf_bytes, p)
-        if txt:
-            addr = parse_address_from_pdf_text(txt)
-            if addr.get("address"):
-                log.info("Address found in PDF text on page %s (%s)", p, addr.get("source"))
-                return addr
-
-    for p in page_order:
-        txt = ocr_single_pdf_page(pdf_bytes, p)
-        if txt:
-            addr = parse_address_from_pdf_text(txt)
-            if addr.get("address"):
-                log.info("Address found in PDF OCR on page %s (%s)", p, addr.get("source"))
-                return addr
+    try:
+        total_pages = len(doc)
+        if total_pages <= 0:
+            return empty_addr()
+
+        page_order = build_adaptive_page_order(total_pages)
+        log.info("Adaptive PDF page order: %s", page_order)
+
+        for p in page_order:
+            txt = read_single_pdf_page(doc, p)
+            if txt:
+                addr = parse_address_from_pdf_text(txt)
+                if addr.get("address"):
+                    log.info("Address found in PDF text on page %s (%s)", p, addr.get("source"))
+                    return addr
+
+        for p in page_order:
+            txt = ocr_single_pdf_page(doc, p)
+            if txt:
+                addr = parse_address_from_pdf_text(txt)
+                if addr.get("address"):
+                    log.info("Address found in PDF OCR on page %s (%s)", p, addr.get("source"))
+                    return addr
+    finally:
+        doc.close()
 
     return empty_addr()
 
@@ -785,29 +878,35 @@ def parse_address_from_property_appraiser_page(text: str) -> dict:
     if not text:
         return empty_addr()
 
-    t = text.replace("\r", "\n")
-    lines = [norm(x) for x in t.splitlines() if norm(x)]
-
     address = None
     municipality = None
     zip_code = None
 
-    for i, line in enumerate(lines):
-        upper = line.upper()
+    # Uma passada só, sem montar a lista de linhas: o label visto fica
+    # pendente e é resolvido pela próxima linha não vazia. Para assim que os
+    # três campos aparecem.
+    pending = None
+    for raw in text.replace("\r", "\n").splitlines():
+        line = norm(raw)
+        if not line:
+            continue
 
-        if upper == "LOCATION ADDRESS" and i + 1 < len(lines):
-            cand = normalize_property_address(lines[i + 1])
+        if pending == "address":
+            cand = normalize_property_address(line)
             if is_valid_property_address(cand):
                 address = cand
-
-        if upper == "MUNICIPALITY" and i + 1 < len(lines):
-            municipality = norm(lines[i + 1]).title()
-
-        if upper == "ZIP" and i + 1 < len(lines):
-            m = re.search(r"(\d{5})", lines[i + 1])
+        elif pending == "municipality":
+            municipality = line.title()
+        elif pending == "zip":
+            m = ZIP5_RE.search(line)
             if m:
                 zip_code = m.group(1)
 
+        if address and municipality and zip_code:
+            break
+
+        pending = APPRAISER_LABELS.get(line.upper())
+
     if address:
         return {
             "address": address,
@@ -820,25 +919,33 @@ def parse_address_from_property_appraiser_page(text: str) -> dict:
     return empty_addr()
 
 
-def fetch_address_from_property_appraiser_url(browser, url: str) -> dict:
-    page = browser.new_page()
+def fetch_address_from_property_appraiser_url(context, url: str) -> dict:
+    cached = get_cached_url("palm_beach_pa", url, APPRAISER_CACHE_TTL_S)
+    if cached is not None:
+        log.info("Property Appraiser address cached for %s", url)
+        return cached
+
+    addr = fetch_address_from_property_appraiser_page(context, url)
+    # Só endereço achado vai para o cache; falha tenta de novo no próximo run.
+    if addr.get("address"):
+        put_cached_url("palm_beach_pa", url, addr)
+    return addr
+
+
+def fetch_address_from_property_appraiser_page(context, url: str) -> dict:
+    # Aba no context do run (já com o bloqueio de assets), em vez de um
+    # context novo por fallback via browser.new_page().
+    page = context.new_page()
     try:
         log.info("Final fallback opening Property Appraiser URL: %s", url)
         page.goto(url, wait_until="domcontentloaded", timeout=30000)
 
-        try:
-            page.wait_for_load_state("networkidle", timeout=10000)
-        except PWTimeout:
-            pass
-
         try:
             page.locator("text=LOCATION ADDRESS").first.wait_for(timeout=10000)
         except PWTimeout:
             log.info("LOCATION ADDRESS not found within 10s; parsing body anyway")
 
-        page.wait_for_timeout(1200)
-
-        body_text = page.locator("body").inner_text(timeout=10000)
+        body_text = html_text(page.content())
         addr = parse_address_from_property_appraiser_page(body_text)
 
         if not addr.get("address"):
@@ -922,8 +1029,7 @@ def do_status_search_like_human(page):
     log.info("Palm Beach search window: %s -> %s", from_date, to_date)
 
     page.goto(STATUS_URL, wait_until="domcontentloaded", timeout=30000)
-    wait_network_quiet(page, 10000)
-    page.wait_for_timeout(1800)
+    wait_for_selector_quiet(page, STATUS_FORM_SELECTOR, 10000)
 
     from_input, to_input = find_from_to_inputs(page)
     if from_input is None or to_input is None:
@@ -936,22 +1042,23 @@ def do_status_search_like_human(page):
     if not clicked:
         raise RuntimeError("Could not click Search for Status button")
 
-    wait_network_quiet(page, 15000)
-    page.wait_for_timeout(2200)
+    wait_for_results(page, timeout=15000)
 
 
 def parse_summary_from_row_text(row_text: str) -> dict:
     txt = norm(row_text)
 
-    def pick(pattern):
-        m = re.search(pattern, txt, re.I)
-        return norm(m.group(1)) if m else ""
+    found = {}
+    for m in ROW_SUMMARY_RE.finditer(txt):
+        found.setdefault(m.lastgroup, norm(m.group(m.lastgroup)))
+        if len(found) == ROW_SUMMARY_FIELDS:
+            break
 
-    case_number = pick(r"(?:Case Number|Case)\s*[:#]?\s*([A-Z0-9\-\/]+)")
-    parcel_number = pick(r"(?:Parcel ID|Parcel|PCN)\s*[:#]?\s*([A-Z0-9\-]+)")
-    sale_date = pick(r"(?:Auction Date|Sale Date|Date)\s*[:#]?\s*([0-9]{1,2}/[0-9]{1,2}/[0-9]{4})")
-    status = pick(r"Status\s*[:#]?\s*([A-Z ]+)")
-    opening_bid = pick(r"(?:Opening Bid|Min Bid|Minimum Bid)\s*[:#]?\s*\$?\s*([0-9,]+\.\d{2}|[0-9,]+)")
+    case_number = found.get("case_number", "")
+    parcel_number = found.get("parcel_number", "")
+    sale_date = found.get("sale_date", "")
+    status = found.get("status", "")
+    opening_bid = found.get("opening_bid", "")
 
     return {
         "tax_sale_id": case_number or None,
@@ -966,18 +1073,22 @@ def extract_case_rows_from_current_results(page) -> List[dict]:
     rows_out = []
     seen = set()
 
-    rows = page.locator("tr[role='row'][id]")
-    count = rows.count()
+    # Um único evaluate traz id + texto de todas as linhas do grid.
+    rows = page.evaluate(
+        """
+        () => Array.from(document.querySelectorAll("tr[role='row'][id]"))
+            .map(r => ({ id: r.id || "", text: r.innerText || "" }))
+        """
+    )
 
-    for i in range(count):
+    for row in rows:
         try:
-            row = rows.nth(i)
-            row_id = norm(row.get_attribute("id") or "")
+            row_id = norm(row.get("id"))
             if not row_id or row_id.lower() == "jqgfirstrow" or not row_id.isdigit():
                 continue
 
             case_url = f"{BASE_URL}/Home/Details?id={row_id}"
-            row_text = norm(row.inner_text() or "")
+            row_text = norm(row.get("text"))
             parsed = parse_summary_from_row_text(row_text)
 
             key = (row_id, case_url)
@@ -1019,11 +1130,7 @@ def goto_next_results_page(page) -> bool:
                         continue
 
                     if item.is_visible():
-                        old_first = ""
-                        try:
-                            old_first = norm(page.locator("tr[role='row'][id]").nth(1).inner_text() or "")
-                        except Exception:
-                            pass
+                        old_first = first_result_row_id(page)
 
                         try:
                             item.scroll_into_view_if_needed(timeout=3000)
@@ -1038,18 +1145,7 @@ def goto_next_results_page(page) -> bool:
                             except Exception:
                                 continue
 
-                        wait_network_quiet(page, 12000)
-                        page.wait_for_timeout(1500)
-
-                        new_first = ""
-                        try:
-                            new_first = norm(page.locator("tr[role='row'][id]").nth(1).inner_text() or "")
-                        except Exception:
-                            pass
-
-                        if old_first and new_first and old_first != new_first:
-                            return True
-
+                        wait_for_results(page, old_first, timeout=12000)
                         return True
                 except Exception:
                     continue
@@ -1062,13 +1158,6 @@ def goto_next_results_page(page) -> bool:
 def discover_sale_rows(page) -> Tuple[List[dict], int]:
     do_status_search_like_human(page)
 
-    try:
-        page.locator("tr[role='row'][id]").first.wait_for(timeout=10000)
-    except Exception:
-        pass
-
-    page.wait_for_timeout(2000)
-
     all_rows = []
     seen_row_ids = set()
     pages_processed = 0
@@ -1100,29 +1189,30 @@ def discover_sale_rows(page) -> Tuple[List[dict], int]:
 # CASE DETAIL HTML
 # =========================
 def is_valid_case(html: str) -> bool:
-    t = html.lower()
-    return (
-        "case number" in t and
-        "parcel id" in t and
-        "auction date" in t
-    )
+    return all(marker_re.search(html) for marker_re in VALID_CASE_MARKERS_RE)
 
 
 def parse_case(html: str, url: str) -> dict:
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text("\n")
-
-    def pick(label):
-        m = re.search(rf"{re.escape(label)}\s*\n\s*(.+)", text, re.I)
-        return norm(m.group(1)) if m else None
+    # lxml (libxml2) no lugar do BeautifulSoup + html.parser em Python puro;
+    # o texto sai dos mesmos nós (sem script/style), um por linha.
+    root = lxml.html.fromstring(html)
+    text = html_text(root)
+
+    # Os campos ficam num bloco no topo da página: para de varrer assim que
+    # todos os labels apareceram, em vez de percorrer o resto do HTML.
+    fields = {}
+    for m in CASE_DETAIL_RE.finditer(text):
+        fields.setdefault(CASE_DETAIL_LABELS[m.group(1).lower()], norm(m.group(2)))
+        if len(fields) == len(CASE_DETAIL_LABELS):
+            break
 
     tax_url = None
     pdf_url = None
     property_appraiser_url = None
 
-    for a in soup.find_all("a", href=True):
-        label = norm(a.get_text()).lower()
-        href = urljoin(url, a["href"])
+    for a in root.xpath("//a[@href]"):
+        label = norm(a.text_content()).lower()
+        href = urljoin(url, a.get("href"))
 
         if "tax collector" in label:
             tax_url = href
@@ -1133,12 +1223,12 @@ def parse_case(html: str, url: str) -> dict:
         if "property appraiser" in label:
             property_appraiser_url = href
 
-    case_number = pick("Case Number")
-    parcel_number = pick("Parcel ID")
-    sale_date = pick("Auction Date")
-    status = pick("Status")
-    opening_bid = pick("Opening Bid")
-    applicant = pick("Applicant Names")
+    case_number = fields.get("case_number")
+    parcel_number = fields.get("parcel_number")
+    sale_date = fields.get("sale_date")
+    status = fields.get("status")
+    opening_bid = fields.get("opening_bid")
+    applicant = fields.get("applicant")
 
     return {
         "node": case_number,
@@ -1154,6 +1244,64 @@ def parse_case(html: str, url: str) -> dict:
     }
 
 
+def build_http_session() -> requests.Session:
+    s = requests.Session()
+    s.headers.update(HEADERS)
+    pool = max(FETCH_WORKERS, 1)
+    adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+# Resposta não-PDF até esse tamanho é lida só para devolver a conexão ao pool.
+NON_PDF_DRAIN_MAX = 64 * 1024
+
+
+def fetch_case_bundle(s: requests.Session, case_url: str) -> dict:
+    """
+    Baixa o detalhe do case e, se for SALE, o PDF do certificado, e já extrai
+    o endereço do PDF (num processo do pool) enquanto o loop principal segue.
+    """
+    r = s.get(case_url, timeout=30)
+    if r.status_code != 200 or not is_valid_case(r.text):
+        raise RuntimeError(f"Invalid case detail page status={r.status_code}")
+
+    case = parse_case(r.text, r.url)
+    pdf_bytes = None
+
+    if norm(case.get("status")).upper() == "SALE" and case.get("pdf"):
+        try:
+            # stream: o corpo só é baixado depois de conferir o content-type,
+            # então uma página de erro grande não é lida à toa. Fechar sem ler
+            # faz o urllib3 descartar a conexão; corpo curto (página de erro
+            # comum) é drenado para a conexão voltar ao pool.
+            with s.get(case["pdf"], timeout=60, stream=True) as pdf:
+                if "pdf" in norm(pdf.headers.get("content-type")).lower():
+                    pdf_bytes = pdf.content
+                else:
+                    length = pdf.headers.get("content-length") or ""
+                    if length.isdigit() and int(length) <= NON_PDF_DRAIN_MAX:
+                        pdf.content
+            if pdf_bytes is None:
+                log.warning(
+                    "Non-PDF response for case=%s: %s",
+                    case.get("case"),
+                    pdf.headers.get("content-type"),
+                )
+        except Exception as e:
+            log.warning("PDF read failed for case=%s: %s", case.get("case"), str(e))
+
+    addr = empty_addr()
+    if pdf_bytes:
+        try:
+            addr = extract_pdf_addr(pdf_bytes)
+        except Exception as e:
+            log.warning("PDF read failed for case=%s: %s", case.get("case"), str(e))
+
+    return {"case": case, "addr": addr}
+
+
 # =========================
 # LIST PRECHECK DECISION
 # =========================
@@ -1268,11 +1416,69 @@ def build_payload_from_case(case: dict, addr: dict) -> dict:
     }
 
 
+# =========================
+# WRITES
+# =========================
+# Rodam numa thread de escrita de run_palm_beach (como no Miami): enquanto o
+# Supabase/app respondem, o loop principal já segue para o próximo case.
+def save_sale_date_only(existing: dict, sale_date: Optional[str]) -> dict:
+    upd = supabase_update_sale_date(existing["id"], sale_date)
+
+    if upd.get("sent"):
+        existing["sale_date"] = sale_date
+        mini_payload = {
+            "county": "PalmBeach",
+            "state": "FL",
+            "node": existing.get("node"),
+            "tax_sale_id": existing.get("tax_sale_id"),
+            "parcel_number": existing.get("parcel_number"),
+            "sale_date": sale_date,
+            "auction_source_url": existing.get("auction_source_url"),
+        }
+        send(mini_payload)
+
+    return {
+        "node": existing.get("node"),
+        "mode": "update_sale_date_only",
+        **upd,
+    }
+
+
+def save_case_payload(payload: dict, existing: Optional[dict], indexes: dict) -> dict:
+    final_node = norm(payload.get("node"))
+    tax_sale_id = norm(payload.get("tax_sale_id"))
+    parcel_number = norm(payload.get("parcel_number"))
+    sale_date = normalize_sale_date_value(payload.get("sale_date"))
+
+    sb_result = supabase_insert_or_update_property(payload)
+
+    if sb_result.get("sent"):
+        if existing and existing.get("id"):
+            payload["id"] = existing.get("id")
+
+        indexes["by_node"][final_node] = payload
+        if tax_sale_id and parcel_number:
+            indexes["by_tax_sale_parcel"][(tax_sale_id, parcel_number)] = payload
+        if tax_sale_id:
+            indexes["by_tax_sale_id"][tax_sale_id] = payload
+        if parcel_number and sale_date:
+            indexes["by_parcel_sale_date"][(parcel_number, sale_date)] = payload
+
+        send(payload)
+
+    return {
+        "node": final_node,
+        "mode": "full_upsert",
+        **sb_result,
+    }
+
+
 # =========================
 # MAIN
 # =========================
 def run_palm_beach():
     log.info("=== Palm Beach FINAL V2.1 ===")
+    warm_pdf_pool("adapters.palm_beach", "pypdfium2", "pytesseract")
 
     supabase_rows = supabase_fetch_all_palm_beach_records() if CAN_CHECK_SUPABASE else []
     indexes = build_supabase_indexes(supabase_rows)
@@ -1286,38 +1492,52 @@ def run_palm_beach():
     sale_date_only_updates = 0
     detail_opens = 0
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=HEADLESS)
-        context = browser.new_context()
-        page = context.new_page()
+    browser = get_browser(headless=HEADLESS, args=LEAN_CHROMIUM_ARGS)
+    context = browser.new_context()
+    # Sem bloquear CSS: visible_elements depende dele para achar os inputs.
+    context.route("**/*", resource_blocker())
+    page = context.new_page()
 
+    try:
+        discovered_rows, pages_processed = discover_sale_rows(page)
+        log.info(
+            "Discovered %s case rows from search across %s page(s)",
+            len(discovered_rows),
+            pages_processed,
+        )
+    finally:
         try:
-            discovered_rows, pages_processed = discover_sale_rows(page)
-            log.info(
-                "Discovered %s case rows from search across %s page(s)",
-                len(discovered_rows),
-                pages_processed,
-            )
-        finally:
-            try:
-                page.close()
-            except Exception:
-                pass
+            page.close()
+        except Exception:
+            pass
 
-        if not discovered_rows:
-            log.warning("No case rows discovered from search")
-            try:
-                browser.close()
-            except Exception:
-                pass
-            return
+    if not discovered_rows:
+        log.warning("No case rows discovered from search")
+        try:
+            context.close()
+        except Exception:
+            pass
+        return
+
+    s = build_http_session()
+    fetch_pool = ThreadPoolExecutor(max_workers=max(FETCH_WORKERS, 1))
+
+    # Prefetch dos detalhes que provavelmente serão abertos, para que o
+    # download de case + PDF rode em paralelo com o parse/upsert do loop.
+    prefetched = {}
+    for idx, row in enumerate(discovered_rows, start=1):
+        if decide_list_action(row, indexes)["action"] == "open_detail":
+            prefetched[idx] = fetch_pool.submit(fetch_case_bundle, s, row.get("case_url"))
 
-        s = requests.Session()
-        s.headers.update(HEADERS)
+    log.info("Prefetching %s case details with %s workers", len(prefetched), FETCH_WORKERS)
 
-        processed_rows = 0
-        resolved_final_nodes = set()
+    processed_rows = 0
+    resolved_final_nodes = set()
 
+    writer = ThreadPoolExecutor(max_workers=1)
+    pending_writes = []
+
+    try:
         for idx, row in enumerate(discovered_rows, start=1):
             row_id = norm(row.get("row_id"))
             case_url = row.get("case_url")
@@ -1346,6 +1566,9 @@ def run_palm_beach():
                 if provisional_tax_sale_id:
                     seen_nodes_this_run.add(provisional_tax_sale_id)
 
+                if decision["action"] != "open_detail" and idx in prefetched:
+                    prefetched.pop(idx).cancel()
+
                 if decision["action"] == "skip":
                     fast_skips += 1
                     if provisional_tax_sale_id:
@@ -1354,26 +1577,12 @@ def run_palm_beach():
 
                 if decision["action"] == "update_sale_date_only":
                     existing = decision["existing"]
-                    upd = supabase_update_sale_date(existing["id"], decision["site_sale_date"])
                     sale_date_only_updates += 1
-                    supabase_results.append({
-                        "node": existing.get("node"),
-                        "mode": "update_sale_date_only",
-                        **upd,
-                    })
-
-                    if upd.get("sent"):
-                        existing["sale_date"] = decision["site_sale_date"]
-                        mini_payload = {
-                            "county": "PalmBeach",
-                            "state": "FL",
-                            "node": existing.get("node"),
-                            "tax_sale_id": existing.get("tax_sale_id"),
-                            "parcel_number": existing.get("parcel_number"),
-                            "sale_date": decision["site_sale_date"],
-                            "auction_source_url": existing.get("auction_source_url"),
-                        }
-                        send(mini_payload)
+                    pending_writes.append((
+                        row_id,
+                        case_url,
+                        writer.submit(save_sale_date_only, existing, decision["site_sale_date"]),
+                    ))
 
                     if existing.get("node"):
                         resolved_final_nodes.add(norm(existing.get("node")))
@@ -1382,11 +1591,10 @@ def run_palm_beach():
 
                 detail_opens += 1
 
-                r = s.get(case_url, timeout=30)
-                if r.status_code != 200 or not is_valid_case(r.text):
-                    raise RuntimeError(f"Invalid case detail page status={r.status_code}")
+                future = prefetched.pop(idx, None)
+                bundle = future.result() if future else fetch_case_bundle(s, case_url)
 
-                case = parse_case(r.text, r.url)
+                case = bundle["case"]
                 status_value = norm(case.get("status")).upper()
 
                 if status_value != "SALE":
@@ -1403,27 +1611,11 @@ def run_palm_beach():
 
                 seen_nodes_this_run.add(final_node)
 
-                addr = empty_addr()
-
-                if case.get("pdf"):
-                    try:
-                        pdf = s.get(case["pdf"], timeout=60)
-                        if "pdf" in norm(pdf.headers.get("content-type")).lower():
-                            addr = extract_pdf_addr(pdf.content)
-                        else:
-                            log.warning(
-                                "Non-PDF response for case=%s: %s",
-                                case.get("case"),
-                                pdf.headers.get("content-type"),
-                            )
-                    except Exception as e:
-                        log.warning("PDF read failed for case=%s: %s", case.get("case"), str(e))
-
-                addr = sanitize_address_payload(addr)
+                addr = sanitize_address_payload(bundle["addr"])
 
                 if not addr.get("address") and case.get("property_appraiser"):
                     log.info("Address missing after PDF → trying Property Appraiser fallback")
-                    pa_addr = fetch_address_from_property_appraiser_url(browser, case["property_appraiser"])
+                    pa_addr = fetch_address_from_property_appraiser_url(context, case["property_appraiser"])
                     pa_addr = sanitize_address_payload(pa_addr)
                     if pa_addr.get("address"):
                         addr = pa_addr
@@ -1451,29 +1643,13 @@ def run_palm_beach():
                     resolved_final_nodes.add(final_node)
                     continue
 
-                sb_result = supabase_insert_or_update_property(payload)
-                supabase_results.append({
-                    "node": final_node,
-                    "mode": "full_upsert",
-                    **sb_result,
-                })
-
-                if sb_result.get("sent"):
-                    if existing and existing.get("id"):
-                        payload["id"] = existing.get("id")
-
-                    indexes["by_node"][final_node] = payload
-                    if tax_sale_id and parcel_number:
-                        indexes["by_tax_sale_parcel"][(tax_sale_id, parcel_number)] = payload
-                    if tax_sale_id:
-                        indexes["by_tax_sale_id"][tax_sale_id] = payload
-                    if parcel_number and sale_date:
-                        indexes["by_parcel_sale_date"][(parcel_number, sale_date)] = payload
-
-                    send(payload)
+                pending_writes.append((
+                    row_id,
+                    case_url,
+                    writer.submit(save_case_payload, payload, existing, indexes),
+                ))
 
                 resolved_final_nodes.add(final_node)
-                time.sleep(0.8)
 
             except Exception as e:
                 log.exception("ERROR row_id=%s url=%s", row_id, case_url)
@@ -1482,60 +1658,77 @@ def run_palm_beach():
                     "case_url": case_url,
                     "error": str(e),
                 })
+    finally:
+        # Mesmo com exceção no meio do loop as escritas já enfileiradas
+        # drenam: o resultado delas entra em failures/supabase_results.
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
 
-        expected_total_items = len(discovered_rows)
-        completed_all_pages = processed_rows == expected_total_items
+        for row_id, case_url, fut in pending_writes:
+            try:
+                supabase_results.append(fut.result())
+            except Exception as e:
+                log.exception("ERROR saving row_id=%s url=%s", row_id, case_url)
+                failures.append({
+                    "row_id": row_id,
+                    "case_url": case_url,
+                    "error": str(e),
+                })
+        writer.shutdown()
 
-        can_delete_missing = (
-            SAFE_DELETE_ENABLED
-            and completed_all_pages
-            and expected_total_items > 0
-            and len(failures) == 0
-            and len(resolved_final_nodes) > 0
-        )
+    expected_total_items = len(discovered_rows)
+    completed_all_pages = processed_rows == expected_total_items
 
-        if can_delete_missing:
-            reconcile_result = reconcile_supabase_to_site(resolved_final_nodes, indexes)
-        else:
-            reconcile_result = {
-                "executed": False,
-                "reason": (
-                    f"safe delete blocked: "
-                    f"SAFE_DELETE_ENABLED={SAFE_DELETE_ENABLED}, "
-                    f"completed_all_pages={completed_all_pages}, "
-                    f"expected_total_items={expected_total_items}, "
-                    f"resolved_final_nodes={len(resolved_final_nodes)}, "
-                    f"failures_count={len(failures)}"
-                ),
-            }
+    can_delete_missing = (
+        SAFE_DELETE_ENABLED
+        and completed_all_pages
+        and expected_total_items > 0
+        and len(failures) == 0
+        and len(resolved_final_nodes) > 0
+    )
 
-        final_payload = {
-            "source": "PalmBeach",
-            "mode": "final_v2_1",
-            "expected_total_items": expected_total_items,
-            "processed_rows": processed_rows,
-            "seen_nodes_count": len(seen_nodes_this_run),
-            "resolved_final_nodes_count": len(resolved_final_nodes),
-            "fast_skips": fast_skips,
-            "sale_date_only_updates": sale_date_only_updates,
-            "detail_opens": detail_opens,
-            "records_count": len(results),
-            "failures_count": len(failures),
-            "can_delete_missing": can_delete_missing,
-            "supabase_results_count": len(supabase_results),
-            "reconcile_result": reconcile_result,
-            "records": results,
-            "failures": failures,
+    if can_delete_missing:
+        reconcile_result = reconcile_supabase_to_site(resolved_final_nodes, indexes)
+    else:
+        reconcile_result = {
+            "executed": False,
+            "reason": (
+                f"safe delete blocked: "
+                f"SAFE_DELETE_ENABLED={SAFE_DELETE_ENABLED}, "
+                f"completed_all_pages={completed_all_pages}, "
+                f"expected_total_items={expected_total_items}, "
+                f"resolved_final_nodes={len(resolved_final_nodes)}, "
+                f"failures_count={len(failures)}"
+            ),
         }
 
-        log.info("===== FINAL PAYLOAD =====")
-        log.info(json.dumps(final_payload, indent=2))
-        print(json.dumps(final_payload, indent=2))
+    final_payload = {
+        "source": "PalmBeach",
+        "mode": "final_v2_1",
+        "expected_total_items": expected_total_items,
+        "processed_rows": processed_rows,
+        "seen_nodes_count": len(seen_nodes_this_run),
+        "resolved_final_nodes_count": len(resolved_final_nodes),
+        "fast_skips": fast_skips,
+        "sale_date_only_updates": sale_date_only_updates,
+        "detail_opens": detail_opens,
+        "records_count": len(results),
+        "failures_count": len(failures),
+        "can_delete_missing": can_delete_missing,
+        "supabase_results_count": len(supabase_results),
+        "reconcile_result": reconcile_result,
+        "records": results,
+        "failures": failures,
+    }
+
+    log.info("===== FINAL PAYLOAD =====")
+    final_json = dumps_text(final_payload, indent=True)
+    log.info(final_json)
+    print(final_json)
 
-        try:
-            browser.close()
-        except Exception:
-            pass
+    try:
+        context.close()
+    except Exception:
+        pass
 
 
 if __name__ == "__main__":
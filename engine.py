@@ -1,5 +1,11 @@
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+
 from scraper import run
+from adapters._browser import close_browsers
+from adapters._pdf_pool import shutdown_pdf_pool
 from adapters.palm_beach import run_palm_beach
 from adapters.miami import run_miami
 
@@ -9,10 +15,17 @@ COUNTY_RUNNERS = {
     "MiamiDade": run_miami,
 }
 
-def main():
-    with open("counties.json") as f:
-        counties = json.load(f)
+# Os counties não compartilham estado; com PARALLEL_COUNTIES=true cada um roda
+# na sua thread (e com o seu Chromium, já que o singleton é por thread).
+PARALLEL_COUNTIES = os.getenv("PARALLEL_COUNTIES", "false").lower() == "true"
 
+
+def load_enabled_runners(path="counties.json"):
+    """Lê counties.json uma vez e resolve a lista (name, runner) dos habilitados."""
+    with open(path, "rb") as f:
+        counties = orjson.loads(f.read())
+
+    runners = []
     for c in counties:
         if not c["enabled"]:
             continue
@@ -24,8 +37,38 @@ def main():
             print(f"No adapter for {name}")
             continue
 
-        print(f"=== Running {name} ===")
+        runners.append((name, runner))
+
+    return runners
+
+
+def run_county(name, runner):
+    print(f"=== Running {name} ===")
+    try:
         runner()
+    finally:
+        # Em modo paralelo cada thread fecha o próprio browser.
+        if PARALLEL_COUNTIES:
+            close_browsers()
+
+
+def main():
+    runners = load_enabled_runners()
+
+    # Todos os counties reaproveitam o mesmo Chromium (ver adapters._browser);
+    # ele só é fechado aqui no final.
+    try:
+        if PARALLEL_COUNTIES and len(runners) > 1:
+            with ThreadPoolExecutor(max_workers=len(runners)) as pool:
+                futures = [pool.submit(run_county, name, runner) for name, runner in runners]
+                for fut in futures:
+                    fut.result()
+        else:
+            for name, runner in runners:
+                run_county(name, runner)
+    finally:
+        close_browsers()
+        shutdown_pdf_pool()
 
 if __name__ == "__main__":
     main()
@@ -5,6 +5,7 @@ import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
@@ -195,6 +196,19 @@ def run_scraper_module(county: str) -> dict:
     return final
 
 
+def run_scraper_module_in_thread(county: str) -> dict:
+    """
+    Variante de run_scraper_module para o modo paralelo: o Playwright sync é
+    preso à thread, então cada county fecha o próprio Chromium ao terminar.
+    """
+    from adapters._browser import close_browsers
+
+    try:
+        return run_scraper_module(county)
+    finally:
+        close_browsers()
+
+
 # =========================================================
 # MAIN RUNNER
 # =========================================================
@@ -207,16 +221,23 @@ def run() -> dict:
       COUNTIES=orange,miami
       CONTINUE_ON_ERROR=true
       FAIL_FAST=true
+      PARALLEL_COUNTIES=true
     """
     target_counties = resolve_target_counties()
 
     continue_on_error = env_bool("CONTINUE_ON_ERROR", True)
     fail_fast = env_bool("FAIL_FAST", False)
+    parallel = env_bool("PARALLEL_COUNTIES", False)
 
     # fail_fast tem prioridade prática
     if fail_fast:
         continue_on_error = False
 
+    # Em paralelo não dá para abortar os counties que já estão rodando,
+    # então fail_fast força o modo serial.
+    if parallel and continue_on_error and len(target_counties) > 1:
+        return run_parallel(target_counties)
+
     log.info("Target counties: %s", ", ".join(target_counties))
     log.info(
         "Execution mode: continue_on_error=%s fail_fast=%s",
@@ -285,6 +306,52 @@ def run() -> dict:
     return final
 
 
+def run_parallel(target_counties: List[str]) -> dict:
+    """Roda os counties ao mesmo tempo, cada um na sua thread e no seu Chromium."""
+    log.info("Target counties (parallel): %s", ", ".join(target_counties))
+
+    results = []
+    failures = []
+    started_at = time.time()
+
+    with ThreadPoolExecutor(max_workers=len(target_counties)) as pool:
+        futures = [
+            (county, pool.submit(run_scraper_module_in_thread, county))
+            for county in target_counties
+        ]
+        for county, fut in futures:
+            try:
+                results.append(fut.result())
+            except Exception as e:
+                log.exception("County failed: %s", county)
+                failures.append({
+                    "county": county,
+                    "success": False,
+                    "error": str(e),
+                })
+
+    total_elapsed = round(time.time() - started_at, 2)
+    success = len(failures) == 0
+
+    final = {
+        "success": success,
+        "mode": "parallel",
+        "counties_requested": target_counties,
+        "counties_completed": [r["county"] for r in results],
+        "results": results,
+        "failures": failures,
+        "elapsed_seconds": total_elapsed,
+    }
+
+    log.info(
+        "Parallel run finished success_count=%s failure_count=%s elapsed=%.2fs",
+        len(results),
+        len(failures),
+        total_elapsed,
+    )
+    return final
+
+
 def main():
     result = run()
     print(result)
@@ -0,0 +1,43 @@
+from adapters.miami import resolve_list_columns, row_fields_from_cells
+
+# Saída do evaluate de collect_case_rows para uma página da lista de cases
+# (cabeçalho + uma linha), com a application vazia como aparece no site.
+LIST_HEADERS = ["Status", "Case Number", "Date Created", "Application Number", "Parcel Number", "Sale Date"]
+LIST_ROW_CELLS = ["ACTIVE", "2024A00123", "01/15/2024", "", "30-2108-000-0010", "03/20/2025"]
+
+
+def test_fields_follow_header_with_empty_cell_in_place():
+    columns = resolve_list_columns(LIST_HEADERS)
+    fields = row_fields_from_cells(LIST_ROW_CELLS, LIST_HEADERS, columns)
+
+    assert fields == {
+        "status": "ACTIVE",
+        "case_number": "2024A00123",
+        "date_created": "01/15/2024",
+        "application_number": "",
+        "parcel_number": "30-2108-000-0010",
+        "sale_date": "03/20/2025",
+    }
+
+
+def test_columns_resolved_by_header_not_position():
+    headers = ["", "Case #", "Case Status", "Folio", "Auction Date"]
+    cells = ["", "2024A00123", "ACTIVE", "30-2108-000-0010", "03/20/2025"]
+
+    fields = row_fields_from_cells(cells, headers, resolve_list_columns(headers))
+
+    assert fields["case_number"] == "2024A00123"
+    assert fields["status"] == "ACTIVE"
+    assert fields["parcel_number"] == "30-2108-000-0010"
+    assert fields["sale_date"] == "03/20/2025"
+
+
+def test_unrecognized_header_fails_closed():
+    headers = ["Col A", "Col B", "Col C"]
+    assert resolve_list_columns(headers) is None
+    assert row_fields_from_cells(["a", "b", "c"], headers, None) == {}
+
+
+def test_row_with_different_cell_count_fails_closed():
+    columns = resolve_list_columns(LIST_HEADERS)
+    assert row_fields_from_cells(LIST_ROW_CELLS[:5], LIST_HEADERS, columns) == {}